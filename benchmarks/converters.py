@@ -0,0 +1,83 @@
+"""
+Micro-benchmark of the temporal converters.
+
+Compares the converters in :mod:`trio_mysql.converters` with the
+regex-only parsing they used before, on values formatted the way MySQL
+sends them.
+
+Run with ``python benchmarks/converters.py``.
+"""
+from __future__ import print_function
+
+import datetime
+import re
+import timeit
+
+from trio_mysql import converters
+
+
+DATETIME_RE = re.compile(r"(\d{1,4})-(\d{1,2})-(\d{1,2})[T ](\d{1,2}):(\d{1,2}):(\d{1,2})(?:.(\d{1,6}))?")
+TIMEDELTA_RE = re.compile(r"(-)?(\d{1,3}):(\d{1,2}):(\d{1,2})(?:.(\d{1,6}))?")
+TIME_RE = re.compile(r"(\d{1,2}):(\d{1,2}):(\d{1,2})(?:.(\d{1,6}))?")
+
+
+def _fraction(s):
+    if not s:
+        return 0
+    return int(s.ljust(6, '0')[:6])
+
+
+def regex_datetime(obj):
+    groups = list(DATETIME_RE.match(obj).groups())
+    groups[-1] = _fraction(groups[-1])
+    return datetime.datetime(*[int(x) for x in groups])
+
+
+def regex_timedelta(obj):
+    groups = list(TIMEDELTA_RE.match(obj).groups())
+    groups[-1] = _fraction(groups[-1])
+    negate = -1 if groups[0] else 1
+    hours, minutes, seconds, microseconds = groups[1:]
+    return datetime.timedelta(hours=int(hours), minutes=int(minutes),
+                              seconds=int(seconds), microseconds=int(microseconds)) * negate
+
+
+def regex_time(obj):
+    groups = list(TIME_RE.match(obj).groups())
+    groups[-1] = _fraction(groups[-1])
+    hours, minutes, seconds, microseconds = groups
+    return datetime.time(hour=int(hours), minute=int(minutes),
+                         second=int(seconds), microsecond=int(microseconds))
+
+
+def split_date(obj):
+    return datetime.date(*[int(x) for x in obj.split('-', 2)])
+
+
+CASES = [
+    ('DATETIME', '2007-02-24 23:06:20', regex_datetime, converters.convert_datetime),
+    ('DATETIME(6)', '2007-02-24 23:06:20.511581', regex_datetime, converters.convert_datetime),
+    ('TIMESTAMP', '2007-02-24 23:06:20', regex_datetime, converters.convert_mysql_timestamp),
+    ('TIME', '-838:59:59', regex_timedelta, converters.convert_timedelta),
+    ('TIME(6)', '12:34:56.789012', regex_timedelta, converters.convert_timedelta),
+    ('TIME as time', '23:06:20', regex_time, converters.convert_time),
+    ('DATE', '2007-02-24', split_date, converters.convert_date),
+]
+
+
+def bench(func, value, number):
+    return min(timeit.repeat(lambda: func(value), number=number, repeat=5)) / number
+
+
+def main(number=100000):
+    print('%-14s %12s %12s %8s' % ('column', 'before ns', 'after ns', 'speedup'))
+    for name, value, before, after in CASES:
+        assert before(value) == after(value), name
+        t_before = bench(before, value, number)
+        t_after = bench(after, value, number)
+        print('%-14s %12.0f %12.0f %7.2fx' % (
+            name, t_before * 1e9, t_after * 1e9, t_before / t_after))
+
+
+if __name__ == '__main__':
+    main()
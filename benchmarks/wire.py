@@ -0,0 +1,213 @@
+"""
+Benchmarks of the client on the wire, against the fake server of
+:mod:`trio_mysql.bench.server` running in the same process.
+
+The server replays result sets which were encoded in advance, so the
+numbers are mostly the cost of trio_mysql itself: connecting, sending
+queries, and reading and decoding packets.
+
+For each benchmark, this prints the throughput in rows (or connections,
+or queries) per second and in bytes per second on the socket, and, from
+a separate run, the peak memory traced by :mod:`tracemalloc` and the
+memory blocks still allocated at the end, both per row.
+
+Run with ``python benchmarks/wire.py``. ``--save`` stores the results in
+``benchmarks/baseline.json``, and later runs show the change against it.
+``--check PERCENT`` exits with status 1 when a throughput dropped by more
+than PERCENT, or when a benchmark keeps more blocks per row. Baselines
+only compare to runs on the same machine and Python version.
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import trio
+import trio.testing
+
+import trio_mysql
+from trio_mysql.bench.server import TABLE_QUERY, sample_server
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+class Bench(object):
+    """The fake server and a connection to it, shared by the benchmarks."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.server = sample_server(rows)
+        self.insert_rows = [(i, 'name %d' % i, i / 7.0) for i in range(rows)]
+        self.port = None
+        self.conn = None
+
+    def connect(self):
+        return trio_mysql.connect(host='127.0.0.1', port=self.port, user='bench',
+                                  password='bench', db='bench', charset='utf8mb4',
+                                  local_infile=True)
+
+    async def connect_close(self):
+        count = max(self.rows // 250, 20)
+        transferred = 0
+        for i in range(count):
+            async with self.connect() as conn:
+                pass
+            transferred += conn._bytes_sent + conn._bytes_received
+        return count, transferred, None
+
+    async def point_query(self):
+        count = max(self.rows // 25, 200)
+        async with self.conn.cursor() as c:
+            for i in range(count):
+                await c.execute('SELECT v FROM kv WHERE k = %s', (1,))
+                await c.fetchone()
+        return count, None, None
+
+    async def fetch_buffered(self):
+        async with self.conn.cursor() as c:
+            await c.execute(TABLE_QUERY)
+            rows = await c.fetchall()
+        return len(rows), None, rows
+
+    async def fetch_unbuffered(self):
+        count = 0
+        async with self.conn.cursor(trio_mysql.cursors.SSCursor) as c:
+            await c.execute(TABLE_QUERY)
+            while True:
+                rows = await c.fetchmany(1000)
+                if not rows:
+                    break
+                count += len(rows)
+        return count, None, None
+
+    async def executemany(self):
+        async with self.conn.cursor() as c:
+            await c.executemany('INSERT INTO t (id, name, score) VALUES (%s, %s, %s)',
+                                self.insert_rows)
+        return len(self.insert_rows), None, None
+
+    async def load_rows(self):
+        async with self.conn.cursor() as c:
+            await c.load_rows('t', ['id', 'name', 'score'], self.insert_rows)
+        return len(self.insert_rows), None, None
+
+    BENCHMARKS = ['connect_close', 'point_query', 'fetch_buffered', 'fetch_unbuffered',
+                  'executemany', 'load_rows']
+
+    async def measure(self, name, repeat):
+        func = getattr(self, name)
+        best = None
+        for i in range(repeat):
+            before = self.conn._bytes_sent + self.conn._bytes_received
+            start = time.perf_counter()
+            count, transferred, kept = await func()
+            elapsed = time.perf_counter() - start
+            if transferred is None:
+                transferred = self.conn._bytes_sent + self.conn._bytes_received - before
+            del kept
+            if best is None or elapsed < best[0]:
+                best = (elapsed, count, transferred)
+        elapsed, count, transferred = best
+
+        # the rows of the previous run are still referenced by the
+        # connection, and would be freed during this one
+        self.conn._result = None
+        await trio.testing.wait_all_tasks_blocked()
+        gc.collect()
+        blocks = sys.getallocatedblocks()
+        tracemalloc.start()
+        count, transferred_, kept = await func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        await trio.testing.wait_all_tasks_blocked()
+        gc.collect()
+        blocks = sys.getallocatedblocks() - blocks
+        del kept
+
+        return {
+            'rows_per_s': count / elapsed,
+            'bytes_per_s': transferred / elapsed,
+            'peak_bytes_per_row': peak / count,
+            'blocks_per_row': blocks / count,
+        }
+
+    async def run(self, names, repeat):
+        results = {}
+        async with trio.open_nursery() as nursery:
+            self.port = await self.server.start(nursery)
+            async with self.connect() as self.conn:
+                for name in names:
+                    results[name] = await self.measure(name, repeat)
+            nursery.cancel_scope.cancel()
+        return results
+
+
+def compare(results, baseline, threshold):
+    """Print the results, and return the names of those which regressed."""
+    regressed = []
+    print('%-18s %12s %10s %12s %11s %9s' % (
+        'benchmark', 'rows/s', 'MB/s', 'peak B/row', 'blocks/row', 'baseline'))
+    for name, result in results.items():
+        change = ''
+        base = baseline.get(name)
+        if base is not None:
+            ratio = result['rows_per_s'] / base['rows_per_s'] - 1
+            change = '%+.1f%%' % (ratio * 100)
+            if threshold is not None and (
+                    ratio < -threshold / 100 or
+                    result['blocks_per_row'] > base['blocks_per_row'] + 0.5):
+                regressed.append(name)
+        print('%-18s %12.0f %10.1f %12.0f %11.2f %9s' % (
+            name, result['rows_per_s'], result['bytes_per_s'] / 1e6,
+            result['peak_bytes_per_row'], result['blocks_per_row'], change))
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('names', nargs='*', metavar='benchmark',
+                        help='benchmarks to run, among: ' + ', '.join(Bench.BENCHMARKS))
+    parser.add_argument('--rows', type=int, default=50000,
+                        help='rows per result set, insert and upload (default: 50000)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='runs of each benchmark, the fastest is kept (default: 5)')
+    parser.add_argument('--save', action='store_true',
+                        help='store the results as the baseline')
+    parser.add_argument('--check', type=float, metavar='PERCENT',
+                        help='exit with status 1 on regressions against the baseline')
+    args = parser.parse_args()
+    for name in args.names:
+        if name not in Bench.BENCHMARKS:
+            parser.error('unknown benchmark %r' % name)
+
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+    bench = Bench(args.rows)
+    results = trio.run(bench.run, args.names or Bench.BENCHMARKS, args.repeat)
+    regressed = compare(results, baseline.get('benchmarks', {}), args.check)
+
+    if args.save:
+        baseline = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'rows': args.rows,
+            'benchmarks': dict(baseline.get('benchmarks', {}), **results),
+        }
+        with open(BASELINE, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+    if regressed:
+        print('regressed: ' + ', '.join(regressed))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
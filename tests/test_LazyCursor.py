@@ -0,0 +1,39 @@
+import datetime
+import pickle
+
+import pytest
+
+from tests import base
+import trio_mysql.cursors
+from trio_mysql.connections import LazyRow
+
+__all__ = ["TestLazyCursor", "TestSSLazyCursor"]
+
+
+class TestLazyCursor(base.TrioMySQLTestCase):
+    cursor_type = trio_mysql.cursors.LazyCursor
+
+    @pytest.mark.trio
+    async def test_lazy_rows(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        query = ("SELECT 1, 'a', NULL, CAST('2020-01-02 03:04:05' AS DATETIME), 2.5e0 "
+                 "UNION ALL SELECT 2, REPEAT('b', 300), 3, NULL, NULL")
+        expected = [(1, 'a', None, datetime.datetime(2020, 1, 2, 3, 4, 5), 2.5),
+                    (2, 'b' * 300, 3, None, None)]
+        for prepared in (False, True):
+            async with conn.cursor(self.cursor_type) as c:
+                await c.execute(query, prepared=prepared)
+                rows = list(await c.fetchall())
+            self.assertIsInstance(rows[0], LazyRow)
+            self.assertEqual(datetime.datetime(2020, 1, 2, 3, 4, 5), rows[0][3])
+            self.assertEqual('b' * 300, rows[1][-4])
+            self.assertEqual(('b' * 300, 3), rows[1][1:3])
+            self.assertEqual(5, len(rows[0]))
+            self.assertEqual(expected, rows)
+            self.assertEqual(hash(expected[0]), hash(rows[0]))
+            self.assertEqual(expected[1], pickle.loads(pickle.dumps(rows[1])))
+
+
+class TestSSLazyCursor(TestLazyCursor):
+    cursor_type = trio_mysql.cursors.SSLazyCursor
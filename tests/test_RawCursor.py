@@ -0,0 +1,30 @@
+import pytest
+
+from tests import base
+import trio_mysql.cursors
+from trio_mysql import err
+from trio_mysql.constants import FIELD_TYPE
+
+__all__ = ["TestRawCursor", "TestSSRawCursor"]
+
+
+class TestRawCursor(base.TrioMySQLTestCase):
+    cursor_type = trio_mysql.cursors.RawCursor
+
+    @pytest.mark.trio
+    async def test_raw_rows(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        async with conn.cursor(self.cursor_type) as c:
+            await c.execute("SELECT 1 AS a, 'x' AS b, NULL AS c, "
+                            "CAST('2020-01-02 03:04:05' AS DATETIME) AS d")
+            self.assertEqual(['a', 'b', 'c', 'd'], [d[0] for d in c.description])
+            self.assertEqual(FIELD_TYPE.DATETIME, c.description[3][1])
+            self.assertEqual((b'1', b'x', None, b'2020-01-02 03:04:05'), await c.fetchone())
+
+            with self.assertRaises(err.NotSupportedError):
+                await c.execute("SELECT 1", prepared=True)
+
+
+class TestSSRawCursor(TestRawCursor):
+    cursor_type = trio_mysql.cursors.SSRawCursor
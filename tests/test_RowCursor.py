@@ -0,0 +1,54 @@
+import pickle
+
+import pytest
+
+from tests import base
+import trio_mysql.cursors
+
+__all__ = ["TestRowCursor", "TestSSRowCursor"]
+
+
+class TestRowCursor(base.TrioMySQLTestCase):
+    cursor_type = trio_mysql.cursors.RowCursor
+
+    @pytest.mark.trio
+    async def test_row(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        async with conn.cursor(self.cursor_type) as c:
+            await c.execute("SELECT 1 AS id, 'bob' AS name, 3 AS `count`, 4 AS `a b`")
+            row = await c.fetchone()
+            self.assertEqual((1, 'bob', 3, 4), row)
+            self.assertEqual(1, row.id)
+            self.assertEqual('bob', row['name'])
+            self.assertEqual('bob', row[1])
+            # names which clash with tuple methods or are not identifiers
+            # are only available as keys
+            self.assertEqual(3, row['count'])
+            self.assertEqual(4, row['a b'])
+            self.assertEqual(['id', 'name', 'count', 'a b'], row.keys())
+            self.assertEqual({'id': 1, 'name': 'bob', 'count': 3, 'a b': 4}, row._asdict())
+            self.assertIsNone(row.get('missing'))
+            with self.assertRaises(KeyError):
+                row['missing']
+            self.assertEqual(row, pickle.loads(pickle.dumps(row)))
+
+            await c.execute("SELECT 1 AS id UNION SELECT 2")
+            rows = await c.fetchall()
+            self.assertEqual([1, 2], [r.id for r in rows])
+            # the rows of a result set share their class
+            self.assertIs(type(rows[0]), type(rows[1]))
+
+    @pytest.mark.trio
+    async def test_duplicate_names(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        async with conn.cursor(self.cursor_type) as c:
+            await c.execute("SELECT a.x, b.x FROM (SELECT 1 AS x) a, (SELECT 2 AS x) b")
+            row = await c.fetchone()
+            self.assertEqual(1, row.x)
+            self.assertEqual(2, row['b.x'])
+
+
+class TestSSRowCursor(TestRowCursor):
+    cursor_type = trio_mysql.cursors.SSRowCursor
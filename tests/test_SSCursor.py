@@ -1,5 +1,6 @@
 import sys
 import pytest
+import trio
 
 from tests import base
 import trio_mysql.cursors
@@ -104,3 +105,103 @@ class TestSSCursor(base.TrioMySQLTestCase):
 
 __all__ = ["TestSSCursor"]
 
+
+class TestSSCursorStream(base.TrioMySQLTestCase):
+    @pytest.mark.trio
+    async def test_stream_value(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        cursor = conn.cursor(trio_mysql.cursors.SSCursor)
+        try:
+            await cursor.execute("SELECT REPEAT('x', 100000) UNION ALL SELECT NULL")
+            stream = await cursor.stream_value()
+            self.assertEqual(stream.length, 100000)
+            data = b''
+            async for chunk in stream:
+                data += chunk
+            self.assertEqual(data, b'x' * 100000)
+
+            stream = await cursor.stream_value()
+            self.assertEqual(stream.length, None)
+            self.assertEqual(await cursor.stream_value(), None)
+
+            # a partially read value is skipped by the next query
+            await cursor.execute("SELECT REPEAT('y', 100000)")
+            await cursor.stream_value()
+            await cursor.execute("SELECT 1")
+            self.assertEqual(await cursor.fetchone(), (1,))
+
+            await cursor.execute("SELECT 1, 2")
+            with self.assertRaises(trio_mysql.err.ProgrammingError):
+                await cursor.stream_value()
+        finally:
+            await cursor.aclose()
+
+__all__.append("TestSSCursorStream")
+
+
+class TestSSCursorBatches(base.TrioMySQLTestCase):
+    @pytest.mark.trio
+    async def test_batches(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        query = ("SELECT a.n * 10 + b.n FROM"
+                 " (SELECT 0 n UNION SELECT 1 UNION SELECT 2 UNION SELECT 3 UNION SELECT 4"
+                 "  UNION SELECT 5 UNION SELECT 6 UNION SELECT 7 UNION SELECT 8 UNION SELECT 9) a,"
+                 " (SELECT 0 n UNION SELECT 1 UNION SELECT 2 UNION SELECT 3 UNION SELECT 4"
+                 "  UNION SELECT 5 UNION SELECT 6 UNION SELECT 7 UNION SELECT 8 UNION SELECT 9) b"
+                 " ORDER BY 1")
+        for cursorclass in (trio_mysql.cursors.SSCursor, trio_mysql.cursors.Cursor):
+            cursor = conn.cursor(cursorclass)
+            try:
+                await cursor.execute(query)
+                self.assertEqual([(0,), (1,), (2,)], list(await cursor.fetchmany(3)))
+                sizes = []
+                rows = []
+                async for batch in cursor.batches(40):
+                    sizes.append(len(batch))
+                    rows.extend(batch)
+                self.assertEqual([40, 40, 17], sizes)
+                self.assertEqual([(i,) for i in range(3, 100)], rows)
+                self.assertEqual(0, len(await cursor.fetchmany(5)))
+                self.assertEqual(100, cursor.rownumber)
+            finally:
+                await cursor.aclose()
+
+__all__.append("TestSSCursorBatches")
+
+
+class TestSSCursorPrefetch(base.TrioMySQLTestCase):
+    @pytest.mark.trio
+    async def test_prefetch(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        query = "SELECT REPEAT('x', 1000) FROM information_schema.columns LIMIT 200"
+        cursor = conn.cursor(trio_mysql.cursors.SSCursor)
+        try:
+            for kwargs in ({}, {"max_rows": 3}, {"max_bytes": 5000}):
+                await cursor.execute(query)
+                async with cursor.prefetch(**kwargs):
+                    rows = [await cursor.fetchone()]
+                    async for batch in cursor.batches(30):
+                        rows.extend(batch)
+                self.assertEqual([("x" * 1000,)] * 200, rows)
+
+            # stopped early, the rest of the result is skipped
+            await cursor.execute(query)
+            async with cursor.prefetch(max_rows=10):
+                self.assertEqual(5, len(await cursor.fetchmany(5)))
+                await cursor.execute("SELECT 1")
+            self.assertEqual((1,), await cursor.fetchone())
+
+            # leaving the block stops the task and skips the rest
+            await cursor.execute(query)
+            async with cursor.prefetch(max_rows=10):
+                self.assertEqual(5, len(await cursor.fetchmany(5)))
+            self.assertEqual([], await cursor.fetchall())
+            await cursor.execute("SELECT 2")
+            self.assertEqual((2,), await cursor.fetchone())
+        finally:
+            await cursor.aclose()
+
+__all__.append("TestSSCursorPrefetch")
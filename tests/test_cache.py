@@ -0,0 +1,117 @@
+import pytest
+import trio
+
+import trio_mysql
+from trio_mysql import cursors
+from tests import base
+
+__all__ = ["TestResultCache"]
+
+
+class TestResultCache(base.TrioMySQLTestCase):
+    def connect_cached(self, cache):
+        params = self.databases[0].copy()
+        params["result_cache"] = cache
+        return trio_mysql.connect(**params)
+
+    async def rand(self, conn, cursorclass=cursors.Cursor, **kwargs):
+        async with conn.cursor(cursorclass) as c:
+            await c.execute("SELECT RAND(), %s", ("x",), **kwargs)
+            return (await c.fetchone())[0]
+
+    @pytest.mark.trio
+    async def test_cache(self, set_me_up):
+        await set_me_up(self)
+        cache = trio_mysql.ResultCache()
+        async with self.connect_cached(cache) as conn:
+            first = await self.rand(conn, cache_ttl=60, cache_tags=("rand",))
+            self.assertEqual(first, await self.rand(conn, cache_ttl=60))
+            async with conn.cursor(cursors.DictCursor) as c:
+                c.cache_ttl = 60
+                await c.execute("SELECT RAND(), %s", ("x",))
+                self.assertEqual({"RAND()": first, "x": "x"}, await c.fetchone())
+            # without a TTL, or in unbuffered cursors, the cache is not used
+            self.assertNotEqual(first, await self.rand(conn))
+            self.assertNotEqual(first, await self.rand(conn, cursors.SSCursor, cache_ttl=60))
+            self.assertEqual(1, len(cache))
+
+            cache.invalidate("rand")
+            self.assertEqual(0, len(cache))
+            second = await self.rand(conn, cache_ttl=0.1)
+            self.assertNotEqual(first, second)
+            await trio.sleep(0.2)
+            self.assertNotEqual(second, await self.rand(conn, cache_ttl=0.1))
+
+    @pytest.mark.trio
+    async def test_max_bytes(self, set_me_up):
+        await set_me_up(self)
+        cache = trio_mysql.ResultCache()
+        async with self.connect_cached(cache) as conn:
+            await self.rand(conn, cache_ttl=60)
+            cache.max_bytes = cache.size
+            async with conn.cursor() as c:
+                await c.execute("SELECT 1", cache_ttl=60)
+            # the least recently used result was dropped
+            self.assertEqual(1, len(cache))
+            self.assertTrue(cache.size <= cache.max_bytes)
+
+    @pytest.mark.trio
+    async def test_single_flight(self, set_me_up):
+        await set_me_up(self)
+        cache = trio_mysql.ResultCache()
+        results = []
+
+        async def query():
+            async with self.connect_cached(cache) as conn:
+                async with conn.cursor() as c:
+                    await c.execute("SELECT SLEEP(0.2), RAND()", cache_ttl=60)
+                    results.append(await c.fetchone())
+
+        async with trio.open_nursery() as nursery:
+            nursery.start_soon(query)
+            nursery.start_soon(query)
+        self.assertEqual(2, len(results))
+        self.assertEqual(results[0], results[1])
+
+    @pytest.mark.trio
+    async def test_unread_result(self, set_me_up):
+        await set_me_up(self)
+        cache = trio_mysql.ResultCache()
+        async with self.connect_cached(cache) as conn:
+            first = await self.rand(conn, cache_ttl=60)
+            ss = conn.cursor(cursors.SSCursor)
+            await ss.execute("SELECT 1 UNION SELECT 2")
+            await ss.fetchone()
+            # the cache hit reads the rest of the unbuffered result first
+            with pytest.warns(UserWarning):
+                self.assertEqual(first, await self.rand(conn, cache_ttl=60))
+            async with conn.cursor() as c:
+                await c.execute("SELECT 3")
+                self.assertEqual((3,), await c.fetchone())
+
+    @pytest.mark.trio
+    async def test_executemany(self, set_me_up):
+        await set_me_up(self)
+        cache = trio_mysql.ResultCache()
+        async with self.connect_cached(cache) as conn:
+            async with conn.cursor() as c:
+                c.cache_ttl = 60
+                await c.execute("CREATE TEMPORARY TABLE cached (id INT)")
+                await c.executemany("INSERT INTO cached VALUES (%s)", [(1,), (2,)])
+                self.assertEqual(2, c.rowcount)
+            # only result sets are cached
+            self.assertEqual(0, len(cache))
+
+    @pytest.mark.trio
+    async def test_connection_settings(self, set_me_up):
+        await set_me_up(self)
+        cache = trio_mysql.ResultCache()
+        params = self.databases[0].copy()
+        params["result_cache"] = cache
+        async with trio_mysql.connect(**params) as conn:
+            first = await self.rand(conn, cache_ttl=60)
+        params["use_unicode"] = False
+        async with trio_mysql.connect(**params) as conn:
+            # connections with other settings don't share results
+            self.assertNotEqual(first, await self.rand(conn, cache_ttl=60))
+        self.assertEqual(2, len(cache))
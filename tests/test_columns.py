@@ -0,0 +1,66 @@
+import pytest
+
+import trio_mysql.cursors
+from tests import base
+
+__all__ = ["TestColumns"]
+
+
+class TestColumns(base.TrioMySQLTestCase):
+    async def prepare_table(self, conn):
+        await self.safe_create_table(
+            conn, "test_columns",
+            "create table test_columns (i int, u bigint unsigned, d double, s varchar(10))")
+        async with conn.cursor() as c:
+            await c.executemany("insert into test_columns values (%s, %s, %s, %s)",
+                                [(1, 2**64 - 1, 0.5, "a"), (None, 2, None, None), (-3, None, 1.5, "c")])
+
+    @pytest.mark.trio
+    async def test_fetch_columns(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        await self.prepare_table(conn)
+        query = "select * from test_columns order by d is null, d"
+        for cursorclass in (trio_mysql.cursors.Cursor, trio_mysql.cursors.SSCursor,
+                            trio_mysql.cursors.PreparedCursor):
+            async with conn.cursor(cursorclass) as c:
+                await c.execute(query)
+                i, u, d, s = await c.fetch_columns()
+                self.assertEqual(["i", "u", "d", "s"], [i.name, u.name, d.name, s.name])
+                self.assertEqual(("i", [1, -3, 0]), (i.values.typecode, i.values.tolist()))
+                self.assertEqual(("Q", [2**64 - 1, 0, 2]), (u.values.typecode, u.values.tolist()))
+                self.assertEqual([0.5, 1.5, 0.0], d.values.tolist())
+                self.assertEqual(["a", "c", None], s.values)
+                self.assertEqual([bytearray(b"\0\0\1"), bytearray(b"\0\1\0"),
+                                  bytearray(b"\0\0\1"), bytearray(b"\0\0\1")],
+                                 [i.nulls, u.nulls, d.nulls, s.nulls])
+                self.assertEqual(0, len((await c.fetch_columns())[0]))
+
+    @pytest.mark.trio
+    async def test_fetch_columns_streaming(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        await self.prepare_table(conn)
+        async with conn.cursor(trio_mysql.cursors.SSCursor) as c:
+            await c.execute("select i from test_columns order by d is null, d")
+            self.assertEqual([1, -3], (await c.fetch_columns(2))[0].values.tolist())
+            column, = await c.fetch_columns(2)
+            self.assertEqual((1, bytearray(b"\1")), (len(column), column.nulls))
+            self.assertEqual(3, c.rownumber)
+
+    @pytest.mark.trio
+    async def test_to_numpy(self, set_me_up):
+        numpy = pytest.importorskip("numpy")
+        await set_me_up(self)
+        conn = self.connections[0]
+        await self.prepare_table(conn)
+        async with conn.cursor() as c:
+            await c.execute("select i, s from test_columns order by d is null, d")
+            i, s = await c.fetch_columns()
+        array = i.to_numpy()
+        self.assertEqual(numpy.int32, array.dtype)
+        self.assertEqual([1, -3, None], array.tolist())
+        # no copy was made
+        i.values[0] = 7
+        self.assertEqual(7, array[0])
+        self.assertEqual(["a", "c", None], s.to_numpy().tolist())
@@ -5,6 +5,8 @@ import trio
 import trio_mysql
 import pytest
 import socket
+import struct
+import zlib
 from tests import base
 
 
@@ -453,6 +455,51 @@ class TestConnection(base.TrioMySQLTestCase):
         await cur.execute("SELECT '" + t + "'")
         assert (await cur.fetchone())[0] == t
 
+    @pytest.mark.trio
+    async def test_small_read_buffer(self, set_me_up):
+        await set_me_up(self)
+        """Packets spanning several socket reads are reassembled"""
+        arg = self.databases[0].copy()
+        arg['read_buffer_size'] = 3
+        conn = trio_mysql.connect(**arg)
+        await conn.connect()
+        cur = conn.cursor()
+        await cur.execute("SELECT %s, %s", ('a' * 1000, 42))
+        self.assertEqual(('a' * 1000, 42), await cur.fetchone())
+        await conn.aclose()
+
+    @pytest.mark.trio
+    async def test_compress(self, set_me_up):
+        await set_me_up(self)
+        arg = self.databases[0].copy()
+        arg['compress'] = True
+        arg['compress_thread_size'] = 64*1024
+        conn = trio_mysql.connect(**arg)
+        await conn.connect()
+        if not conn.server_capabilities & trio_mysql.constants.CLIENT.COMPRESS:
+            await conn.aclose()
+            pytest.skip("server does not support compression")
+        self.assertTrue(conn._compressed)
+        cur = conn.cursor()
+        await cur.execute("SELECT %s, REPEAT('b', 100000), 42", ('a' * 100000,))
+        self.assertEqual(('a' * 100000, 'b' * 100000, 42), await cur.fetchone())
+        await cur.execute("SELECT 1")
+        self.assertEqual((1,), await cur.fetchone())
+        await conn.aclose()
+
+    @pytest.mark.trio
+    async def test_deprecate_eof(self, set_me_up):
+        await set_me_up(self)
+        con = self.connections[0]
+        if not con.server_capabilities & trio_mysql.constants.CLIENT.DEPRECATE_EOF:
+            pytest.skip("server does not support CLIENT.DEPRECATE_EOF")
+        self.assertTrue(con.client_flag & trio_mysql.constants.CLIENT.DEPRECATE_EOF)
+        cur = con.cursor()
+        await cur.execute("SELECT 1 UNION SELECT 2")
+        self.assertEqual(((1,), (2,)), await cur.fetchall())
+        # the terminating OK packet carries the server status
+        self.assertTrue(con._result.server_status is not None)
+
     @pytest.mark.trio
     async def test_autocommit(self, set_me_up):
         await set_me_up(self)
@@ -598,8 +645,92 @@ class TestConnection(base.TrioMySQLTestCase):
             await conn.connect()
             await conn.aclose()
 
+    @pytest.mark.trio
+    async def test_query_listener(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        traces = []
+        conn.add_query_listener(traces.append)
+        try:
+            async with conn.cursor() as c:
+                await c.execute("SELECT 1 UNION ALL SELECT 2")
+                await c.execute("SELECT %s", (3,), prepared=True)
+                with self.assertRaises(trio_mysql.ProgrammingError):
+                    await c.execute("SELEKT 1")
+            async with conn.cursor(trio_mysql.cursors.SSCursor) as c:
+                await c.execute("SELECT 4")
+                self.assertEqual(3, len(traces))
+                await c.fetchall()
+        finally:
+            conn.remove_query_listener(traces.append)
+        await conn.query("SELECT 5")
+
+        self.assertEqual(4, len(traces))
+        union, prepared, error, unbuffered = traces
+        self.assertEqual("SELECT 1 UNION ALL SELECT 2", union.query)
+        self.assertEqual(2, union.rows)
+        self.assertTrue(union.started <= union.sent <= union.first_packet
+                        <= union.fields_read <= union.finished)
+        self.assertTrue(union.bytes_sent > 0 and union.bytes_received > 0)
+        self.assertIsNone(union.error)
+        self.assertEqual("SELECT ?", prepared.query)
+        self.assertEqual(1, prepared.rows)
+        self.assertIsInstance(error.error, trio_mysql.ProgrammingError)
+        self.assertIsNone(error.fields_read)
+        self.assertEqual(1, unbuffered.rows)
+
 
 # A custom type and function to escape it
+class _ChunkedStream:
+    """Fake socket stream returning prepared chunks of data"""
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    async def receive_some(self, max_bytes=None):
+        return self.chunks.pop(0) if self.chunks else b""
+
+    def close(self):
+        pass
+
+
+class TestCompressedFrames(base.FakeUnittestcase):
+
+    @staticmethod
+    def _frame(seq_id, payload):
+        packet = struct.pack('<I', len(payload))[:3] + bytes([seq_id]) + payload
+        data = zlib.compress(packet)
+        return (struct.pack('<I', len(data))[:3] + bytes([seq_id])
+                + struct.pack('<I', len(packet))[:3] + data)
+
+    @pytest.mark.trio
+    async def test_several_frames_per_read(self):
+        """Compressed frames arriving in one socket read are all used"""
+        conn = trio_mysql.connect(host="localhost")
+        payloads = [b"\x01", b"x" * 1000, b"\xfe\x00\x00\x02\x00"]
+        frames = b"".join(self._frame(i, p) for i, p in enumerate(payloads))
+        conn._sock = _ChunkedStream([frames[:5], frames[5:]])
+        conn._compressed = True
+        conn._next_seq_id = 0
+        for payload in payloads:
+            packet = await conn._read_packet()
+            self.assertEqual(payload, bytes(packet.get_all_data()))
+        self.assertEqual([], conn._sock.chunks)
+
+
+class TestFieldDescriptorPacket(base.FakeUnittestcase):
+
+    def test_does_not_hold_receive_buffer(self):
+        """Column descriptors copy their data out of the receive buffer"""
+        fields = [b"def", b"db", b"t", b"t", b"id", b"id"]
+        payload = b"".join(bytes([len(f)]) + f for f in fields)
+        payload += b"\x0c" + struct.pack("<HIBHBxx", 63, 11, 3, 0, 0)
+        chunk = memoryview(bytearray(payload) + bytearray(64 * 1024))
+        field = trio_mysql.connections.FieldDescriptorPacket(
+            chunk[:len(payload)], "utf8")
+        self.assertEqual(("id", 3), (field.name, field.type_code))
+        self.assertEqual(len(payload), len(field._data.obj))
+
+
 class Foo(object):
     value = "bar"
 
@@ -16,6 +16,18 @@ class TestConverter(base.FakeUnittestcase):
             u"foo\\nbar"
         )
 
+    def test_escape_load_data_item(self):
+        escape = converters.escape_load_data_item
+        self.assertEqual(escape(None, "utf8mb4"), u"\\N")
+        self.assertEqual(escape(u"a\tb\\c\n'", "utf8mb4"), u"a\\tb\\\\c\\n'")
+        self.assertEqual(escape(b"\x00\xff", "utf8mb4"), u"\\0\udcff")
+        self.assertEqual(escape(1.5, "utf8mb4"), u"1.5")
+        self.assertEqual(escape(datetime.date(2020, 1, 2), "utf8mb4"), u"2020-01-02")
+        self.assertEqual(escape(datetime.timedelta(hours=-1), "utf8mb4"), u"-1:00:00")
+        escapers = converters.load_data_escapers()
+        for value in (None, u"a\tb", 5, 1.5, datetime.date(5, 1, 2)):
+            self.assertEqual(escapers[type(value)](value), escape(value, "utf8mb4"))
+
     def test_convert_datetime(self):
         expected = datetime.datetime(2007, 2, 24, 23, 6, 20)
         dt = converters.convert_datetime('2007-02-24 23:06:20')
@@ -58,3 +70,26 @@ class TestConverter(base.FakeUnittestcase):
         expected = datetime.time(23, 6, 20, 511581)
         time_obj = converters.convert_time('23:06:20.511581')
         self.assertEqual(time_obj, expected)
+
+    def test_convert_datetime_fallback(self):
+        # zero dates and non-canonical values keep their old results
+        self.assertEqual(converters.convert_datetime('0000-00-00 00:00:00'),
+                         '0000-00-00 00:00:00')
+        self.assertEqual(converters.convert_datetime('2007-02-31 23:06:20'),
+                         '2007-02-31 23:06:20')
+        self.assertEqual(converters.convert_datetime(b'2007-2-24 3:06:20.5'),
+                         datetime.datetime(2007, 2, 24, 3, 6, 20, 500000))
+        self.assertEqual(converters.convert_datetime('2007-02-24 23:06:20.51'),
+                         datetime.datetime(2007, 2, 24, 23, 6, 20, 510000))
+
+    def test_convert_date_fallback(self):
+        self.assertEqual(converters.convert_date('2007-02-24'), datetime.date(2007, 2, 24))
+        self.assertEqual(converters.convert_date('0000-00-00'), '0000-00-00')
+        self.assertEqual(converters.convert_date('2007-2-4'), datetime.date(2007, 2, 4))
+
+    def test_convert_timedelta_fallback(self):
+        self.assertEqual(converters.convert_timedelta('-00:00:01.5'),
+                         -datetime.timedelta(seconds=1, microseconds=500000))
+        self.assertEqual(converters.convert_timedelta('1:2:3'),
+                         datetime.timedelta(hours=1, minutes=2, seconds=3))
+        self.assertEqual(converters.convert_timedelta('random crap'), 'random crap')
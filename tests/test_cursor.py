@@ -113,3 +113,51 @@ class CursorTest(base.TrioMySQLTestCase):
             self.assertTrue(cursor._executed.endswith(b"(3, 4),(5, 6)"), "executemany with %% not in one query")
         finally:
             await cursor.execute("DROP TABLE IF EXISTS percent_test")
+
+    @pytest.mark.trio
+    async def test_executemany_pipelined(self, set_me_up):
+        await set_me_up(self)
+        conn = self.test_connection
+        for cursorclass in (trio_mysql.cursors.Cursor, trio_mysql.cursors.PreparedCursor):
+            cursor = conn.cursor(cursorclass)
+            cursor.max_pipeline_length = 2
+            await cursor.executemany("update test set data = %s where data = %s",
+                                     [('x', 'row1'), ('x', 'row2'), ('x', 'nope'),
+                                      ('y', 'x'), ('row1', 'y')])
+            self.assertEqual(6, cursor.rowcount)
+            await cursor.execute("select data from test where data = 'row1'")
+            self.assertEqual(2, cursor.rowcount)
+            await cursor.execute("update test set data = 'row2' where data = 'row1' limit 1")
+
+    @pytest.mark.trio
+    async def test_executemany_stops_at_error(self, set_me_up):
+        await set_me_up(self)
+        conn = self.test_connection
+        cursor = conn.cursor()
+        await cursor.execute("SET SESSION sql_mode = 'STRICT_TRANS_TABLES'")
+        # without max_pipeline_length, the statements after an error do not run
+        with self.assertRaises(trio_mysql.DataError):
+            await cursor.executemany("update test set data = %s where data = %s",
+                                     [('x', 'row1'), ('too long value', 'row2'),
+                                      ('x', 'row3')])
+        await cursor.execute("select data from test where data = 'x'")
+        self.assertEqual(1, cursor.rowcount)
+        await cursor.execute("update test set data = 'row1' where data = 'x'")
+
+    @pytest.mark.trio
+    async def test_executemany_types(self, set_me_up):
+        await set_me_up(self)
+        conn = self.test_connection
+        cursor = conn.cursor()
+        await self.safe_create_table(
+            conn, "test_many_types",
+            "create table test_many_types (i int, s varchar(10), b varbinary(10), f double)")
+        # the types of the first row are not the same as in later rows
+        rows = [(1, u"é'\\", b"\x00\xff'", 1.5), (None, 2, None, None), (3, None, bytearray(b"x"), 2)]
+        await cursor.executemany("insert into test_many_types values (%s, %s, %s, %s)", rows)
+        await cursor.executemany("insert into test_many_types (i, s) values (%(i)s, %(s)s)",
+                                 [{"i": 4, "s": "x"}, {"i": 5, "s": None}])
+        await cursor.execute("select * from test_many_types order by i")
+        self.assertEqual(((None, u"2", None, None), (1, u"é'\\", b"\x00\xff'", 1.5),
+                          (3, None, b"x", 2.0), (4, u"x", None, None), (5, None, None, None)),
+                         await cursor.fetchall())
@@ -1,9 +1,11 @@
 import pytest
 
+import trio_mysql
 from trio_mysql import cursors, OperationalError, Warning
 from tests import base
 
 import os
+import trio
 import warnings
 
 __all__ = ["TestLoadLocal"]
@@ -95,3 +97,86 @@ class TestLoadLocal(base.TrioMySQLTestCase):
             await c.execute("DROP TABLE test_load_local")
             await c.aclose()
 
+
+    @pytest.mark.trio
+    async def test_load_rows(self, set_me_up):
+        await set_me_up(self)
+        """Test loading rows from iterables"""
+        conn = self.connections[0]
+        c = conn.cursor()
+        await c.execute("CREATE TABLE test_load_local (a INTEGER, b VARCHAR(20))")
+
+        async def arows():
+            for i in range(3, 5):
+                yield (i, None)
+
+        send, receive = trio.open_memory_channel(10)
+        async with send:
+            await send.send((5, u"five"))
+        try:
+            rows = [(1, u"tab\there"), (2, u"back\\slash\nnewline")]
+            self.assertEqual(2, await c.load_rows("test_load_local", ["a", "b"], rows))
+            self.assertEqual(2, await c.load_rows("test_load_local", ["a", "b"], arows()))
+            self.assertEqual(1, await c.load_rows("test_load_local", ["a", "b"], receive))
+            await c.execute("SELECT a, b FROM test_load_local ORDER BY a")
+            self.assertEqual(
+                ((1, u"tab\there"), (2, u"back\\slash\nnewline"), (3, None), (4, None),
+                 (5, u"five")),
+                await c.fetchall())
+        finally:
+            await c.execute("DROP TABLE test_load_local")
+            await c.aclose()
+
+    @pytest.mark.trio
+    async def test_load_rows_error(self, set_me_up):
+        await set_me_up(self)
+        """Test that failing rows abort the load"""
+        c = self.connections[0].cursor()
+        await c.execute("CREATE TABLE test_load_local (a INTEGER, b TEXT) ENGINE=InnoDB")
+
+        def rows():
+            for i in range(10000):
+                yield (i, u"x" * 100)
+            raise ValueError("no more rows")
+
+        try:
+            async with trio_mysql.connect(**self.databases[0]) as conn:
+                with self.assertRaises(ValueError):
+                    await conn.cursor().load_rows("test_load_local", ["a", "b"], rows())
+                self.assertFalse(conn.open)
+            await c.execute("SELECT COUNT(*) FROM test_load_local")
+            self.assertEqual((0,), await c.fetchone())
+        finally:
+            await c.execute("DROP TABLE test_load_local")
+            await c.aclose()
+
+    @pytest.mark.trio
+    async def test_load_file_progress(self, set_me_up):
+        await set_me_up(self)
+        """Test load local infile in small packets, reporting progress"""
+        params = self.databases[0].copy()
+        params["max_allowed_packet"] = 1024
+        progress = []
+        params["local_infile_progress"] = lambda sent, rate: progress.append(sent)
+        filename = os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                                'data',
+                                'load_local_data.txt')
+        # the file is read in blocks of several packets
+        read_size = trio_mysql.connections.LoadLocalFile.read_size
+        trio_mysql.connections.LoadLocalFile.read_size = 5000
+        async with trio_mysql.connect(**params) as conn:
+            c = conn.cursor()
+            await c.execute("CREATE TABLE test_load_local (a INTEGER, b INTEGER)")
+            try:
+                await c.execute(
+                    ("LOAD DATA LOCAL INFILE '{0}' INTO TABLE " +
+                     "test_load_local FIELDS TERMINATED BY ','").format(filename)
+                )
+                await c.execute("SELECT COUNT(*) FROM test_load_local")
+                self.assertEqual(22749, (await c.fetchone())[0])
+                self.assertEqual(os.path.getsize(filename), progress[-1])
+                self.assertEqual(-(-progress[-1] // 1024), len(progress))
+            finally:
+                trio_mysql.connections.LoadLocalFile.read_size = read_size
+                await c.execute("DROP TABLE test_load_local")
+                await c.aclose()
@@ -0,0 +1,68 @@
+import pytest
+
+import trio_mysql
+from trio_mysql import cursors
+from tests import base
+
+__all__ = ["TestPipeline"]
+
+
+class TestPipeline(base.TrioMySQLTestCase):
+    @pytest.mark.trio
+    async def test_pipeline(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        await self.safe_create_table(
+            conn, "test_pipeline", "create table test_pipeline (id int primary key, v int)")
+        async with conn.pipeline() as p:
+            inserts = [p.execute("insert into test_pipeline values (%s, %s)", (i, i * 10))
+                       for i in range(5)]
+            update = p.execute("update test_pipeline set v = v + 1 where id < %s", (3,),
+                               prepared=True)
+            select = p.execute("select v from test_pipeline order by id")
+        self.assertEqual([1] * 5, [c.rowcount for c in inserts])
+        self.assertEqual(3, update.rowcount)
+        self.assertEqual(((1,), (11,), (21,), (30,), (40,)), await select.fetchall())
+
+    @pytest.mark.trio
+    async def test_error(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        p = conn.pipeline(cursors.DictCursor)
+        before = p.execute("select 1 as a")
+        p.execute("select * from no_such_table")
+        after = p.execute("select 2 as a")
+        with pytest.raises(trio_mysql.err.ProgrammingError):
+            await p.run()
+        # the queries after the failing one still ran
+        self.assertEqual({'a': 1}, await before.fetchone())
+        self.assertEqual({'a': 2}, await after.fetchone())
+
+        async with conn.cursor() as c:
+            await c.execute("select 3")
+            self.assertEqual((3,), await c.fetchone())
+
+    @pytest.mark.trio
+    async def test_unbuffered_cursor(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        with pytest.raises(trio_mysql.err.ProgrammingError):
+            conn.pipeline(cursors.SSCursor)
+
+    @pytest.mark.trio
+    async def test_row_cursors(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        async with conn.pipeline(cursors.RawCursor) as p:
+            raw = p.execute("select 1, 'a'")
+            with pytest.raises(trio_mysql.err.NotSupportedError):
+                p.execute("select 1", prepared=True)
+        self.assertEqual((b'1', b'a'), await raw.fetchone())
+
+        async with conn.pipeline(cursors.LazyCursor) as p:
+            lazy = p.execute("select 1, 'a'")
+            prepared = p.execute("select %s, 'b'", (2,), prepared=True)
+        row = await lazy.fetchone()
+        self.assertIsInstance(row, trio_mysql.connections.LazyRow)
+        self.assertEqual((1, 'a'), row)
+        self.assertEqual((2, 'b'), await prepared.fetchone())
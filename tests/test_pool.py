@@ -0,0 +1,116 @@
+import pytest
+import trio
+
+import trio_mysql
+from trio_mysql import cursors
+from trio_mysql.constants import SERVER_STATUS
+from tests import base
+
+__all__ = ["TestPool"]
+
+
+class TestPool(base.TrioMySQLTestCase):
+    def create_pool(self, minsize=1, maxsize=3, **kwargs):
+        params = self.databases[0].copy()
+        params.update(kwargs)
+        return trio_mysql.create_pool(minsize, maxsize, **params)
+
+    @pytest.mark.trio
+    async def test_acquire(self, set_me_up):
+        await set_me_up(self)
+        async with self.create_pool() as pool:
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute("SELECT 1")
+                    self.assertEqual((1,), await cur.fetchone())
+                thread_id = conn.thread_id()
+            self.assertEqual(1, pool.freesize)
+
+            # the idle connection is reused
+            async with pool.acquire() as conn:
+                self.assertEqual(thread_id, conn.thread_id())
+
+    @pytest.mark.trio
+    async def test_maxsize(self, set_me_up):
+        await set_me_up(self)
+        running = 0
+        max_running = 0
+
+        async with self.create_pool(maxsize=2) as pool:
+            async def worker():
+                nonlocal running, max_running
+                async with pool.acquire() as conn:
+                    running += 1
+                    max_running = max(running, max_running)
+                    async with conn.cursor() as cur:
+                        await cur.execute("SELECT SLEEP(0.1)")
+                    running -= 1
+
+            async with trio.open_nursery() as nursery:
+                for _ in range(5):
+                    nursery.start_soon(worker)
+            self.assertEqual(2, max_running)
+            self.assertTrue(pool.size <= 2)
+
+    @pytest.mark.trio
+    async def test_prewarm(self, set_me_up):
+        await set_me_up(self)
+        async with self.create_pool(minsize=2) as pool:
+            with trio.fail_after(5):
+                while pool.freesize < 2:
+                    await trio.sleep(0.01)
+
+    @pytest.mark.trio
+    async def test_cleanup_on_release(self, set_me_up):
+        await set_me_up(self)
+        await self.safe_create_table(
+            self.connections[0], "test_pool", "create table test_pool (a int)")
+        async with self.create_pool() as pool:
+            async with pool.acquire() as conn:
+                await conn.begin()
+                await conn.cursor().execute("INSERT INTO test_pool VALUES (1)")
+                cur = conn.cursor(cursors.SSCursor)
+                await cur.execute("SELECT 1 UNION SELECT 2")
+                await cur.fetchone()
+
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute("SELECT COUNT(*) FROM test_pool")
+                    self.assertEqual((0,), await cur.fetchone())
+
+    @pytest.mark.trio
+    async def test_rollback_after_select(self, set_me_up):
+        await set_me_up(self)
+        await self.safe_create_table(
+            self.connections[0], "test_pool", "create table test_pool (a int)")
+        async with self.create_pool(autocommit=False) as pool:
+            async with pool.acquire() as conn:
+                cur = conn.cursor(cursors.SSCursor)
+                await cur.execute("SELECT a FROM test_pool FOR UPDATE")
+                await cur.fetchall()
+                # the status of the end of an unbuffered result is seen
+                self.assertTrue(conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS)
+
+            async with pool.acquire() as conn:
+                self.assertFalse(conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS)
+
+    @pytest.mark.trio
+    async def test_connect_error(self, set_me_up):
+        await set_me_up(self)
+        async with self.create_pool(charset="no such charset") as pool:
+            # the background task survives errors other than MySQL ones
+            await trio.sleep(0.1)
+            self.assertFalse(pool.closed)
+            with self.assertRaises(Exception):
+                async with pool.acquire():
+                    pass
+
+    @pytest.mark.trio
+    async def test_max_lifetime(self, set_me_up):
+        await set_me_up(self)
+        async with self.create_pool(max_lifetime=0.1) as pool:
+            async with pool.acquire() as conn:
+                thread_id = conn.thread_id()
+            await trio.sleep(0.2)
+            async with pool.acquire() as conn:
+                self.assertTrue(thread_id != conn.thread_id())
@@ -0,0 +1,72 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+import trio_mysql
+from trio_mysql import cursors
+from tests import base
+
+__all__ = ["TestPrepared"]
+
+
+class TestPrepared(base.TrioMySQLTestCase):
+    async def prepare_table(self, conn):
+        await self.safe_create_table(
+            conn, "test_prepared",
+            "create table test_prepared (id int primary key, u bigint unsigned,"
+            " name varchar(20), d datetime(6), dd date, t time, x double,"
+            " dec_ decimal(5, 2), b blob)")
+
+    @pytest.mark.trio
+    async def test_roundtrip(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        await self.prepare_table(conn)
+        row = (1, 2**64 - 1, u"été", datetime.datetime(2020, 1, 2, 3, 4, 5, 6),
+               datetime.date(2020, 1, 2), datetime.timedelta(hours=-25, seconds=3),
+               1.5, Decimal("1.25"), b"\x00\xff")
+        async with conn.cursor(cursors.PreparedCursor) as c:
+            await c.execute("insert into test_prepared values (%s,%s,%s,%s,%s,%s,%s,%s,%s)", row)
+            self.assertEqual(1, c.rowcount)
+            await c.execute("insert into test_prepared (id) values (%(id)s)", {"id": 2})
+            await c.execute("select * from test_prepared where id = %s", (1,))
+            self.assertEqual(row, await c.fetchone())
+            await c.execute("select * from test_prepared where id = %s", 2)
+            self.assertEqual((2,) + (None,) * 8, await c.fetchone())
+
+    @pytest.mark.trio
+    async def test_statement_cache(self, set_me_up):
+        await set_me_up(self)
+        params = self.databases[0].copy()
+        params["prepared_cache_size"] = 2
+        async with trio_mysql.connect(**params) as conn:
+            async with conn.cursor() as c:
+                for i in range(3):
+                    await c.execute("select %s + " + str(i), (1,), prepared=True)
+                    self.assertEqual((1 + i,), await c.fetchone())
+                self.assertEqual(2, len(conn._prepared))
+                # statements are reused, not prepared again
+                stmt = await conn.prepare("select ? + 2")
+                await c.execute("select %s + 2", (1,), prepared=True)
+                self.assertEqual(stmt, await conn.prepare("select ? + 2"))
+
+    @pytest.mark.trio
+    async def test_unbuffered(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        async with conn.cursor(cursors.SSCursor) as c:
+            await c.execute("select %s union all select %s", (1, 2), prepared=True)
+            self.assertEqual([(1,), (2,)], await c.fetchall())
+
+    @pytest.mark.trio
+    async def test_numeric_rows(self, set_me_up):
+        await set_me_up(self)
+        conn = self.connections[0]
+        async with conn.cursor(cursors.PreparedCursor) as c:
+            # all columns fixed width, with and without NULLs
+            await c.execute("select cast(%s as signed), cast(%s as unsigned), %s + 0e0,"
+                            " cast(%s as signed)", (-1, 2**64 - 1, 0.5, None))
+            self.assertEqual((-1, 2**64 - 1, 0.5, None), await c.fetchone())
+            await c.execute("select cast(%s as signed), %s + 0e0", (7, 1.5))
+            self.assertEqual((7, 1.5), await c.fetchone())
@@ -93,6 +93,9 @@ if _orig_conn.Connection.__init__.__doc__ is not None:
     Connect.__doc__ = _orig_conn.Connection.__init__.__doc__
 del _orig_conn
 
+from .pool import Pool, create_pool
+from .cache import ResultCache
+
 
 def get_client_info():  # for MySQLdb compatibility
     version = VERSION
@@ -117,8 +120,8 @@ __all__ = [
     'DataError', 'DatabaseError', 'Error', 'FIELD_TYPE', 'IntegrityError',
     'InterfaceError', 'InternalError', 'MySQLError', 'NULL', 'NUMBER',
     'NotSupportedError', 'DBAPISet', 'OperationalError', 'ProgrammingError',
-    'ROWID', 'STRING', 'TIME', 'TIMESTAMP', 'Warning', 'apilevel', 'connect',
-    'connections', 'constants', 'converters', 'cursors',
+    'Pool', 'ROWID', 'ResultCache', 'STRING', 'TIME', 'TIMESTAMP', 'Warning', 'apilevel',
+    'connect', 'connections', 'constants', 'converters', 'create_pool', 'cursors',
     'escape_dict', 'escape_sequence', 'escape_string', 'get_client_info',
     'paramstyle', 'threadsafety', 'version_info',
 
@@ -0,0 +1,4 @@
+"""
+Tools to measure trio_mysql on its own, against the fake MySQL server in
+:mod:`trio_mysql.bench.server`.
+"""
@@ -0,0 +1,300 @@
+"""
+How trio_mysql scales with the number of connections of a process.
+
+``python -m trio_mysql.bench.scale --connections 100,1000,5000`` opens
+each number of connections in turn to a fake server, running in another
+process so that it does not weigh on the measurements, and runs a mix
+of queries on all of them for a while. For each step it reports:
+
+- the resident memory (RSS) per connection, once connected and under load,
+  and the memory blocks allocated per connection by Python
+- the queries per second, and the p50 and p99 query latency
+- the event loop lag: how late a task sleeping in a loop wakes up
+
+``--objects`` also lists the kinds of objects which each connection holds,
+to find what makes up the per-connection overhead.
+"""
+import argparse
+import collections
+import gc
+from functools import partial
+import os
+import random
+import subprocess
+import sys
+import time
+
+import trio
+
+import trio_mysql
+from ..cursors import SSCursor
+from .server import TABLE_QUERY
+
+#: The kinds of queries the mix is made of.
+QUERIES = ('point', 'fetch', 'stream', 'insert')
+
+
+def _rss():
+    """Resident memory of the process in bytes, or None if unknown."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, IOError, ValueError):
+        return None
+
+
+def _percentile(values, fraction):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def _object_counts():
+    gc.collect()
+    return collections.Counter(type(o).__qualname__ for o in gc.get_objects())
+
+
+def _raise_open_files_limit():
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def parse_mix(mix):
+    """Parse ``point=8,fetch=1`` into query kinds and their weights."""
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in QUERIES:
+            raise ValueError("unknown query %r, should be one of %s" % (
+                name, ', '.join(QUERIES)))
+        weights[name] = float(weight or 1)
+    return list(weights), list(weights.values())
+
+
+class Step(object):
+    """One number of connections, and what was measured with it."""
+
+    def __init__(self, connections):
+        self.connections = connections
+        self.connect_time = None
+        self.rss_connected = None
+        self.rss_loaded = None
+        self.blocks = None
+        self.objects = None
+        self.queries = 0
+        self.errors = 0
+        self.latencies = []
+        self.lags = []
+        self.duration = None
+
+
+class Harness(object):
+    def __init__(self, args, port):
+        self.args = args
+        self.port = port
+        self.kinds, self.weights = parse_mix(args.mix)
+
+    def connect(self):
+        args = self.args
+        return trio_mysql.connect(host=args.host, port=self.port, user='bench',
+                                  password='bench', db='bench', charset='utf8mb4')
+
+    async def _open(self, conns, limiter):
+        async with limiter:
+            conn = self.connect()
+            await conn.connect()
+            conns.append(conn)
+
+    async def _query(self, conn, kind):
+        if kind == 'point':
+            async with conn.cursor() as c:
+                await c.execute('SELECT v FROM kv WHERE k = %s', (1,))
+                await c.fetchone()
+        elif kind == 'fetch':
+            async with conn.cursor() as c:
+                await c.execute(TABLE_QUERY)
+                await c.fetchall()
+        elif kind == 'stream':
+            async with conn.cursor(SSCursor) as c:
+                await c.execute(TABLE_QUERY)
+                while await c.fetchmany(100):
+                    pass
+        else:
+            async with conn.cursor() as c:
+                await c.execute('INSERT INTO t (id, name) VALUES (%s, %s)', (1, 'name'))
+
+    async def _worker(self, conn, step, deadline):
+        think = self.args.think
+        rng = random.Random(id(conn))
+        # spread the first queries over the think time
+        await trio.sleep(rng.uniform(0, think))
+        while trio.current_time() < deadline:
+            kind = rng.choices(self.kinds, self.weights)[0]
+            start = trio.current_time()
+            try:
+                await self._query(conn, kind)
+            except trio_mysql.MySQLError:
+                step.errors += 1
+            else:
+                step.queries += 1
+                step.latencies.append(trio.current_time() - start)
+            if think:
+                await trio.sleep(rng.uniform(0.5, 1.5) * think)
+
+    async def _watch_lag(self, step, interval):
+        while True:
+            expected = trio.current_time() + interval
+            await trio.sleep(interval)
+            step.lags.append(trio.current_time() - expected)
+
+    async def run_step(self, count):
+        step = Step(count)
+        conns = []
+        gc.collect()
+        rss = _rss()
+        blocks = sys.getallocatedblocks()
+        objects = _object_counts() if self.args.objects else None
+
+        start = time.perf_counter()
+        limiter = trio.CapacityLimiter(self.args.connect_concurrency)
+        async with trio.open_nursery() as nursery:
+            for i in range(count):
+                nursery.start_soon(self._open, conns, limiter)
+        step.connect_time = time.perf_counter() - start
+
+        gc.collect()
+        step.blocks = (sys.getallocatedblocks() - blocks) / count
+        if rss is not None:
+            step.rss_connected = (_rss() - rss) / count
+        if objects is not None:
+            step.objects = _object_counts()
+            step.objects.subtract(objects)
+
+        try:
+            deadline = trio.current_time() + self.args.duration
+            async with trio.open_nursery() as nursery:
+                nursery.start_soon(self._watch_lag, step, self.args.lag_interval)
+                async with trio.open_nursery() as workers:
+                    for conn in conns:
+                        workers.start_soon(self._worker, conn, step, deadline)
+                nursery.cancel_scope.cancel()
+            step.duration = self.args.duration
+            if rss is not None:
+                step.rss_loaded = (_rss() - rss) / count
+        finally:
+            with trio.CancelScope(shield=True):
+                for conn in conns:
+                    await conn.aclose()
+        return step
+
+
+def report_header():
+    print('%6s %8s %10s %10s %8s %8s %8s %8s %8s %8s %8s' % (
+        'conns', 'connect', 'RSS/conn', 'loaded', 'blocks', 'qps',
+        'p50 ms', 'p99 ms', 'lag p50', 'lag p99', 'lag max'))
+
+
+def report(step):
+    def kib(value):
+        return '-' if value is None else '%.1fK' % (value / 1024)
+
+    print('%6d %7.2fs %10s %10s %8.0f %8.0f %8.2f %8.2f %8.2f %8.2f %8.2f' % (
+        step.connections, step.connect_time, kib(step.rss_connected),
+        kib(step.rss_loaded), step.blocks, step.queries / step.duration,
+        _percentile(step.latencies, 0.5) * 1e3, _percentile(step.latencies, 0.99) * 1e3,
+        _percentile(step.lags, 0.5) * 1e3, _percentile(step.lags, 0.99) * 1e3,
+        max(step.lags or [float('nan')]) * 1e3))
+    if step.errors:
+        print('       %d queries failed' % step.errors)
+
+
+def report_objects(step, top=15):
+    print('objects per connection with %d connections:' % step.connections)
+    for name, count in step.objects.most_common(top):
+        if count <= 0:
+            break
+        print('  %8.2f %s' % (count / step.connections, name))
+
+
+async def _start_server(nursery, args):
+    """Run the fake server in a child process, and return its port."""
+    command = [sys.executable, '-m', 'trio_mysql.bench.server',
+               '--host', args.host, '--rows', str(args.rows)]
+    env = dict(os.environ)
+    # the child must import this trio_mysql, even if it is not installed
+    package_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [package_dir, env.get('PYTHONPATH')]))
+    process = await nursery.start(partial(
+        trio.run_process, command, stdout=subprocess.PIPE, check=False, env=env))
+    output = b''
+    while not output.endswith(b'\n'):
+        data = await process.stdout.receive_some()
+        if not data:
+            raise RuntimeError("The fake server did not start")
+        output += data
+    return int(output)
+
+
+async def run(args):
+    steps = []
+    async with trio.open_nursery() as nursery:
+        port = args.port or await _start_server(nursery, args)
+        harness = Harness(args, port)
+        report_header()
+        for count in args.connections:
+            step = await harness.run_step(count)
+            report(step)
+            steps.append(step)
+        nursery.cancel_scope.cancel()
+    if args.objects:
+        for step in steps:
+            report_objects(step)
+    return steps
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m trio_mysql.bench.scale',
+        description="Measure how trio_mysql scales with the number of connections.")
+    parser.add_argument('--connections', default='10,100,1000',
+                        help='numbers of connections to measure, comma separated '
+                             '(default: 10,100,1000)')
+    parser.add_argument('--mix', default='point=8,fetch=1,insert=1',
+                        help='query kinds and their weights, among %s '
+                             '(default: point=8,fetch=1,insert=1)' % ', '.join(QUERIES))
+    parser.add_argument('--duration', type=float, default=5,
+                        help='seconds of queries per number of connections (default: 5)')
+    parser.add_argument('--think', type=float, default=0.1,
+                        help='average seconds between the queries of a connection (default: 0.1)')
+    parser.add_argument('--rows', type=int, default=100,
+                        help='rows of the fetch and stream queries (default: 100)')
+    parser.add_argument('--lag-interval', type=float, default=0.01,
+                        help='seconds between event loop lag samples (default: 0.01)')
+    parser.add_argument('--connect-concurrency', type=int, default=100,
+                        help='connections opened at once (default: 100)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int,
+                        help='port of an already running "python -m trio_mysql.bench.server", '
+                             'instead of starting one')
+    parser.add_argument('--objects', action='store_true',
+                        help='list the objects held per connection')
+    args = parser.parse_args(argv)
+    try:
+        args.connections = [int(n) for n in args.connections.split(',')]
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    _raise_open_files_limit()
+    trio.run(run, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+"""
+A fake MySQL server, to measure the client without the cost of a real one.
+
+It accepts any user and password, answers the queries it knows with
+result sets which were encoded in advance, and any other query with an
+OK packet. ``LOAD DATA LOCAL`` queries read the whole upload and report
+one affected row per line.
+
+``python -m trio_mysql.bench.server`` runs a server with the queries of
+:func:`sample_server` in its own process.
+"""
+import argparse
+import datetime
+from functools import partial
+import struct
+import sys
+
+import trio
+
+from ..connections import MAX_PACKET_LEN, TEXT_TYPES, lenenc_int, pack_int24
+from ..constants import CLIENT, COMMAND, FIELD_TYPE, SERVER_STATUS
+
+CAPABILITIES = (
+    CLIENT.LONG_PASSWORD | CLIENT.LONG_FLAG | CLIENT.CONNECT_WITH_DB |
+    CLIENT.PROTOCOL_41 | CLIENT.TRANSACTIONS | CLIENT.SECURE_CONNECTION |
+    CLIENT.MULTI_RESULTS | CLIENT.PLUGIN_AUTH | CLIENT.LOCAL_FILES |
+    CLIENT.PLUGIN_AUTH_LENENC_CLIENT_DATA | CLIENT.DEPRECATE_EOF)
+
+STATUS = SERVER_STATUS.SERVER_STATUS_AUTOCOMMIT
+
+UTF8MB4_GENERAL_CI = 45
+BINARY = 63
+
+#: Query of :func:`sample_server` returning a single row.
+POINT_QUERY = 'SELECT v FROM kv WHERE k = 1'
+#: Query of :func:`sample_server` returning the sample rows.
+TABLE_QUERY = 'SELECT * FROM t'
+TABLE_COLUMNS = [
+    ('id', FIELD_TYPE.LONGLONG),
+    ('name', FIELD_TYPE.VAR_STRING),
+    ('created', FIELD_TYPE.DATETIME),
+    ('score', FIELD_TYPE.DOUBLE),
+    ('note', FIELD_TYPE.VAR_STRING),
+]
+
+
+def _lenenc_str(value):
+    return lenenc_int(len(value)) + value
+
+
+def _encode_value(value):
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode('utf-8')
+
+
+def _column_definition(name, type_code):
+    name = name.encode('utf-8')
+    charsetnr = UTF8MB4_GENERAL_CI if type_code in TEXT_TYPES else BINARY
+    return (_lenenc_str(b'def') + _lenenc_str(b'bench') + _lenenc_str(b't') +
+            _lenenc_str(b't') + _lenenc_str(name) + _lenenc_str(name) +
+            struct.pack('<BHIBHBxx', 0x0c, charsetnr, 255, type_code, 0, 0))
+
+
+class _Packets(object):
+    """Frames payloads as the packets of one response."""
+
+    def __init__(self, seq_id=1):
+        self.seq_id = seq_id % 256
+        self.parts = []
+
+    def add(self, payload):
+        while True:
+            chunk, payload = payload[:MAX_PACKET_LEN], payload[MAX_PACKET_LEN:]
+            self.parts.append(pack_int24(len(chunk)) + bytes((self.seq_id,)) + chunk)
+            self.seq_id = (self.seq_id + 1) % 256
+            if len(chunk) < MAX_PACKET_LEN:
+                return
+
+    def ok(self, affected_rows=0, header=0):
+        self.add(bytes((header,)) + lenenc_int(affected_rows) + lenenc_int(0) +
+                 struct.pack('<HH', STATUS, 0))
+
+    def eof(self):
+        self.add(b'\xfe' + struct.pack('<HH', 0, STATUS))
+
+    def error(self, errno, message):
+        self.add(b'\xff' + struct.pack('<H', errno) + b'#HY000' + message.encode('utf-8'))
+
+    def data(self):
+        return b''.join(self.parts)
+
+
+class Result(object):
+    """
+    A canned result set.
+
+    :param columns: (name, type code) pairs. Text columns are sent in utf8mb4,
+        the others as binary.
+    :param rows: Sequences of values, sent as their ``str()``. None is NULL.
+    """
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+        self._encoded = {}
+
+    def encode(self, deprecate_eof):
+        """Return the whole response to the query, as sent on the wire."""
+        data = self._encoded.get(deprecate_eof)
+        if data is not None:
+            return data
+        packets = _Packets()
+        packets.add(lenenc_int(len(self.columns)))
+        for name, type_code in self.columns:
+            packets.add(_column_definition(name, type_code))
+        if not deprecate_eof:
+            packets.eof()
+        for row in self.rows:
+            packets.add(b''.join(
+                b'\xfb' if value is None else _lenenc_str(_encode_value(value))
+                for value in row))
+        if deprecate_eof:
+            packets.ok(header=0xfe)
+        else:
+            packets.eof()
+        data = self._encoded[deprecate_eof] = packets.data()
+        return data
+
+    @property
+    def size(self):
+        """Size of the response, in bytes."""
+        return len(self.encode(True))
+
+
+class FakeServer(object):
+    """
+    A fake MySQL server, which serves connections in the current trio run::
+
+        server = FakeServer()
+        server.add_result("SELECT 1", [("1", FIELD_TYPE.LONGLONG)], [(1,)])
+        async with trio.open_nursery() as nursery:
+            port = await server.start(nursery)
+            conn = trio_mysql.connect(host="127.0.0.1", port=port, user="bench")
+
+    :param results: dict mapping query strings to :class:`Result`.
+    """
+
+    def __init__(self, results=None):
+        self.results = dict(results or {})
+        #: Number of connections accepted so far.
+        self.connections = 0
+        #: Number of commands received so far.
+        self.commands = 0
+
+    def add_result(self, query, columns, rows):
+        """Answer query with a result set, see :class:`Result`."""
+        result = self.results[query] = Result(columns, rows)
+        return result
+
+    async def start(self, nursery, host='127.0.0.1', port=0):
+        """Listen for connections until nursery is cancelled.
+
+        :return: The port the server listens on.
+        """
+        listeners = await nursery.start(
+            partial(trio.serve_tcp, self.serve, port, host=host))
+        return listeners[0].socket.getsockname()[1]
+
+    async def serve(self, stream):
+        """Serve a connection from the client."""
+        self.connections += 1
+        try:
+            await _ServerConnection(self, stream).run()
+        except (trio.BrokenResourceError, trio.ClosedResourceError, EOFError):
+            pass
+        finally:
+            await stream.aclose()
+
+
+class _ServerConnection(object):
+    def __init__(self, server, stream):
+        self.server = server
+        self.stream = stream
+        self.buf = bytearray()
+        self.deprecate_eof = False
+
+    async def _read_exactly(self, num_bytes):
+        while len(self.buf) < num_bytes:
+            data = await self.stream.receive_some(256 * 1024)
+            if not data:
+                raise EOFError
+            self.buf += data
+        data = bytes(self.buf[:num_bytes])
+        del self.buf[:num_bytes]
+        return data
+
+    async def read_packet(self):
+        """Return the payload and the sequence id of the next packet."""
+        parts = []
+        while True:
+            header = await self._read_exactly(4)
+            length = int.from_bytes(header[:3], 'little')
+            parts.append(await self._read_exactly(length))
+            if length < MAX_PACKET_LEN:
+                return b''.join(parts), header[3]
+
+    async def run(self):
+        handshake = _Packets(0)
+        salt = b'01234567890123456789'
+        handshake.add(
+            b'\x0a' + b'5.7.99-trio-mysql-bench\0' + struct.pack('<I', 1) +
+            salt[:8] + b'\0' +
+            struct.pack('<HBHHB', CAPABILITIES & 0xffff, UTF8MB4_GENERAL_CI, STATUS,
+                        CAPABILITIES >> 16, len(salt) + 1) +
+            b'\0' * 10 + salt[8:] + b'\0' + b'mysql_native_password\0')
+        await self.stream.send_all(handshake.data())
+
+        response, seq_id = await self.read_packet()
+        client_flag, = struct.unpack_from('<I', response)
+        if client_flag & CLIENT.SSL:
+            raise EOFError("SSL is not supported")
+        self.deprecate_eof = bool(client_flag & CLIENT.DEPRECATE_EOF)
+        packets = _Packets(seq_id + 1)
+        packets.ok()
+        await self.stream.send_all(packets.data())
+
+        while True:
+            payload, seq_id = await self.read_packet()
+            self.server.commands += 1
+            command = payload[0]
+            if command == COMMAND.COM_QUIT:
+                return
+            packets = _Packets(seq_id + 1)
+            if command == COMMAND.COM_QUERY:
+                query = payload[1:].decode('utf-8', 'surrogateescape')
+                result = self.server.results.get(query)
+                if result is not None:
+                    await self.stream.send_all(result.encode(self.deprecate_eof))
+                    continue
+                if query.startswith('LOAD DATA LOCAL'):
+                    await self.load_data(packets)
+                    continue
+                packets.ok(affected_rows=1)
+            elif command in (COMMAND.COM_PING, COMMAND.COM_INIT_DB):
+                packets.ok()
+            else:
+                packets.error(1047, "Unknown command")
+            await self.stream.send_all(packets.data())
+
+    async def load_data(self, packets):
+        packets.add(b'\xfb' + b'bench')
+        await self.stream.send_all(packets.data())
+        lines = 0
+        while True:
+            payload, seq_id = await self.read_packet()
+            if not payload:
+                break
+            lines += payload.count(b'\n')
+        packets = _Packets(seq_id + 1)
+        packets.ok(affected_rows=lines)
+        await self.stream.send_all(packets.data())
+
+
+def sample_server(rows=1000):
+    """A :class:`FakeServer` answering :data:`POINT_QUERY` with one row, and
+    :data:`TABLE_QUERY` with rows rows of :data:`TABLE_COLUMNS`."""
+    server = FakeServer()
+    server.add_result(POINT_QUERY, [('v', FIELD_TYPE.VAR_STRING)], [('value',)])
+    created = datetime.datetime(2020, 1, 2, 3, 4, 5)
+    server.add_result(TABLE_QUERY, TABLE_COLUMNS,
+                      [(i, 'name %d' % i, created, i / 7.0, None) for i in range(rows)])
+    return server
+
+
+async def _serve(server, host, port):
+    async with trio.open_nursery() as nursery:
+        port = await server.start(nursery, host, port)
+        # lets the parent process find the port
+        print(port)
+        sys.stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake MySQL server.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0,
+                        help='port to listen on, printed on startup (default: any)')
+    parser.add_argument('--rows', type=int, default=1000,
+                        help='rows returned by %r (default: 1000)' % TABLE_QUERY)
+    args = parser.parse_args()
+    try:
+        trio.run(_serve, sample_server(args.rows), args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+from collections import OrderedDict
+
+import trio
+
+
+class ResultCache(object):
+    """
+    A client-side cache of query results, which can be shared by the
+    connections of a :class:`~trio_mysql.pool.Pool`.
+
+    Pass it as the ``result_cache`` argument of the connections, then give
+    a TTL to the queries whose results may be reused, per query or for all
+    the queries of a cursor::
+
+        cache = trio_mysql.ResultCache(max_bytes=16*1024*1024)
+        async with trio_mysql.create_pool(result_cache=cache, host=...) as pool:
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute("SELECT * FROM flags", cache_ttl=60,
+                                      cache_tags=("flags",))
+            ...
+            cache.invalidate("flags")
+
+    Results are keyed by the query with its parameters filled in, and by
+    the server, user, database, charset and ``use_unicode`` setting of the
+    connection. When several tasks run the
+    same query at once, only one of them sends it, and the others get its
+    result. The database is the one the connection was opened with or
+    given to :meth:`~trio_mysql.connections.Connection.select_db`; one
+    changed with a ``USE`` statement is not noticed, so connections which
+    do that should not share a cache.
+
+    Only result sets are cached, and not those with warnings or followed
+    by other results. Cursors which are sharing a cached result share its
+    rows, which must not be modified. Connections sharing a cache should
+    use the same ``conv`` setting.
+
+    :param max_bytes: Least recently used results are dropped when the
+        results add up to more than this. The size of a result is the
+        size of the response the server sent for it. (default: 16MB)
+    """
+
+    def __init__(self, max_bytes=16*1024*1024):
+        self.max_bytes = max_bytes
+        #: Total size of the cached results, in bytes.
+        self.size = 0
+        self._entries = OrderedDict()  # key -> (result, size, expires, tags)
+        self._tags = {}  # tag -> set of keys
+        self._running = {}  # key -> trio.Event
+        # bumped by each invalidation, so that results which were being
+        # read meanwhile are not stored
+        self._generation = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def invalidate(self, *tags):
+        """Drop the results which were cached with any of the given tags."""
+        self._generation += 1
+        for tag in tags:
+            for key in self._tags.get(tag, ()).copy():
+                self._remove(key)
+
+    def clear(self):
+        """Drop all the results."""
+        self._generation += 1
+        self._entries.clear()
+        self._tags.clear()
+        self.size = 0
+
+    def _remove(self, key):
+        result, size, expires, tags = self._entries.pop(key)
+        self.size -= size
+        for tag in tags:
+            keys = self._tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] <= trio.current_time():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    async def _get(self, key, run, ttl, tags):
+        """Return the result cached for key, or the one that run() returns.
+
+        run is an async function returning a
+        :class:`~trio_mysql.connections.MySQLResult` and its size.
+        """
+        while True:
+            result = self._lookup(key)
+            if result is not None:
+                return result
+            running = self._running.get(key)
+            if running is None:
+                break
+            await running.wait()
+
+        done = self._running[key] = trio.Event()
+        generation = self._generation
+        try:
+            result, size = await run()
+            if (generation == self._generation and ttl > 0 and
+                    result.description is not None and not result.has_next and
+                    not result.warning_count):
+                self._store(key, result, size, trio.current_time() + ttl, tags)
+        finally:
+            del self._running[key]
+            done.set()
+        return result
+
+    def _store(self, key, result, size, expires, tags):
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        tags = frozenset(tags)
+        self._entries[key] = (result, size, expires, tags)
+        self.size += size
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
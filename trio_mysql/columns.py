@@ -0,0 +1,76 @@
+"""
+Result sets decoded into one buffer per column, see
+:meth:`trio_mysql.cursors.Cursor.fetch_columns`.
+"""
+import array
+
+from .constants import FIELD_TYPE
+
+
+#: :mod:`array` typecodes of the integer and floating point column types,
+#: signed and unsigned. Their sizes match the values of the binary protocol,
+#: and they are also the :mod:`struct` formats those values are read with.
+NUMERIC_TYPECODES = {
+    FIELD_TYPE.TINY: ('b', 'B'),
+    FIELD_TYPE.SHORT: ('h', 'H'),
+    FIELD_TYPE.YEAR: ('h', 'H'),
+    FIELD_TYPE.INT24: ('i', 'I'),
+    FIELD_TYPE.LONG: ('i', 'I'),
+    FIELD_TYPE.LONGLONG: ('q', 'Q'),
+    FIELD_TYPE.FLOAT: ('f', 'f'),
+    FIELD_TYPE.DOUBLE: ('d', 'd'),
+}
+
+
+class Column(object):
+    """
+    The values of one column of a result set.
+
+    For integer and floating point columns, ``values`` is an
+    :class:`array.array` holding 0 for NULL. Other columns have a list of
+    the same values as in rows, with None for NULL. ``nulls`` is a
+    bytearray holding 1 for each NULL value and 0 for the others.
+    """
+
+    __slots__ = ('name', 'type_code', 'values', 'nulls')
+
+    def __init__(self, name, type_code, typecode=None):
+        self.name = name
+        self.type_code = type_code
+        self.values = array.array(typecode) if typecode is not None else []
+        self.nulls = bytearray()
+
+    def __len__(self):
+        return len(self.nulls)
+
+    def __repr__(self):
+        return "<Column %r: %d values>" % (self.name, len(self))
+
+    def _extend(self, values):
+        """Append decoded values, where NULL is None."""
+        self.nulls.extend(value is None for value in values)
+        if isinstance(self.values, array.array):
+            self.values.extend(0 if value is None else value for value in values)
+        else:
+            self.values.extend(values)
+
+    def to_numpy(self):
+        """
+        Return the column as a :class:`numpy.ma.MaskedArray`, masked where
+        the values are NULL.
+
+        The values and the mask of integer and floating point columns are
+        not copied: the arrays share memory with ``values`` and ``nulls``.
+        Other columns become arrays of objects.
+
+        :raise ImportError: If NumPy is not installed.
+        """
+        import numpy
+
+        mask = numpy.frombuffer(self.nulls, dtype=numpy.bool_)
+        if isinstance(self.values, array.array):
+            data = numpy.frombuffer(self.values, dtype=self.values.typecode)
+        else:
+            data = numpy.empty(len(self.values), dtype=object)
+            data[:] = self.values
+        return numpy.ma.MaskedArray(data, mask=mask, copy=False)
@@ -6,22 +6,30 @@ from __future__ import print_function
 from ._compat import  JYTHON, IRONPYTHON
 
 import trio
+import collections
+import collections.abc
+import datetime
+from decimal import Decimal
 import errno
 from functools import partial
 import hashlib
 import io
 import os
+import re
 import socket
 import struct
 import sys
 import traceback
 import warnings
+import zlib
 
 from .charset import MBLENGTH, charset_by_name, charset_by_id
-from .constants import CLIENT, COMMAND, CR, FIELD_TYPE, SERVER_STATUS
+from .columns import Column, NUMERIC_TYPECODES
+from .constants import CLIENT, COMMAND, CR, FIELD_TYPE, FLAG, SERVER_STATUS
 from . import converters
 from .cursors import Cursor
 from .optionfile import Parser
+from .pipeline import Pipeline
 from .util import byte2int, int2byte
 from . import err
 
@@ -198,22 +206,297 @@ def lenenc_int(i):
     else:
         raise ValueError("Encoding %x is larger than %x - no representation in LengthEncodedInteger" % (i, (1 << 64)-1))
 
+
+# https://dev.mysql.com/doc/internals/en/com-stmt-execute.html
+def _pack_binary_param(value, encoding):
+    """Encode one COM_STMT_EXECUTE parameter.
+
+    Returns the type code, the type flags (0x80 for unsigned) and the
+    value in the binary protocol.
+    """
+    if isinstance(value, bool):
+        return FIELD_TYPE.TINY, 0, struct.pack('<b', value)
+    if isinstance(value, int):
+        if -(1 << 63) <= value < (1 << 63):
+            return FIELD_TYPE.LONGLONG, 0, struct.pack('<q', value)
+        if 0 <= value < (1 << 64):
+            return FIELD_TYPE.LONGLONG, 0x80, struct.pack('<Q', value)
+        value = str(value).encode('ascii')
+        return FIELD_TYPE.NEWDECIMAL, 0, lenenc_int(len(value)) + value
+    if isinstance(value, float):
+        return FIELD_TYPE.DOUBLE, 0, struct.pack('<d', value)
+    if isinstance(value, str):
+        value = value.encode(encoding, 'surrogateescape')
+        return FIELD_TYPE.VAR_STRING, 0, lenenc_int(len(value)) + value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = bytes(value)
+        return FIELD_TYPE.BLOB, 0, lenenc_int(len(value)) + value
+    if isinstance(value, datetime.datetime):
+        return FIELD_TYPE.DATETIME, 0, struct.pack(
+            '<BHBBBBBI', 11, value.year, value.month, value.day,
+            value.hour, value.minute, value.second, value.microsecond)
+    if isinstance(value, datetime.date):
+        return FIELD_TYPE.DATE, 0, struct.pack(
+            '<BHBB', 4, value.year, value.month, value.day)
+    if isinstance(value, datetime.timedelta):
+        negative = value < datetime.timedelta(0)
+        if negative:
+            value = -value
+        return FIELD_TYPE.TIME, 0, struct.pack(
+            '<BBIBBBI', 12, negative, value.days, value.seconds // 3600,
+            value.seconds // 60 % 60, value.seconds % 60, value.microseconds)
+    if isinstance(value, datetime.time):
+        return FIELD_TYPE.TIME, 0, struct.pack(
+            '<BBIBBBI', 12, 0, 0, value.hour, value.minute, value.second,
+            value.microsecond)
+    if isinstance(value, Decimal):
+        value = str(value).encode('ascii')
+        return FIELD_TYPE.NEWDECIMAL, 0, lenenc_int(len(value)) + value
+    value = str(value).encode(encoding, 'surrogateescape')
+    return FIELD_TYPE.VAR_STRING, 0, lenenc_int(len(value)) + value
+
+
+# https://dev.mysql.com/doc/internals/en/binary-protocol-value.html
+_unpack_date = struct.Struct('<HBB').unpack_from
+_unpack_time = struct.Struct('<BIBBB').unpack_from
+_unpack_uint32 = struct.Struct('<I').unpack_from
+_unpack_frame_header = struct.Struct('<HBB').unpack_from
+
+
+def _read_binary_datetime(data, pos, type_code):
+    """Decode a DATE, DATETIME or TIMESTAMP value at data[pos].
+
+    Returns the value and the position after it.
+    """
+    length = data[pos]
+    pos += 1
+    year = month = day = hour = minute = second = microsecond = 0
+    if length >= 4:
+        year, month, day = _unpack_date(data, pos)
+    if length >= 7:
+        hour, minute, second = data[pos+4], data[pos+5], data[pos+6]
+    if length >= 11:
+        microsecond = _unpack_uint32(data, pos+7)[0]
+    pos += length
+    try:
+        if type_code == FIELD_TYPE.DATE:
+            return datetime.date(year, month, day), pos
+        return datetime.datetime(year, month, day, hour, minute, second, microsecond), pos
+    except ValueError:
+        # zero or invalid dates come back as text, like with COM_QUERY
+        if type_code == FIELD_TYPE.DATE:
+            return '%04d-%02d-%02d' % (year, month, day), pos
+        return '%04d-%02d-%02d %02d:%02d:%02d' % (
+            year, month, day, hour, minute, second), pos
+
+
+def _read_binary_time(data, pos):
+    """Decode a TIME value at data[pos] into a timedelta.
+
+    Returns the value and the position after it.
+    """
+    length = data[pos]
+    pos += 1
+    if not length:
+        return datetime.timedelta(0), pos
+    negative, days, hour, minute, second = _unpack_time(data, pos)
+    microsecond = _unpack_uint32(data, pos+8)[0] if length >= 12 else 0
+    value = datetime.timedelta(days=days, hours=hour, minutes=minute,
+                               seconds=second, microseconds=microsecond)
+    return (-value if negative else value), pos + length
+
+
+def _read_binary_value(data, pos, kind, a, b):
+    """Decode the variable width value at data[pos] of a binary row.
+
+    kind, a and b are the items of the column in
+    MySQLResult._binary_columns. Returns the value and the position after it.
+    """
+    if kind == _BINARY_DATETIME:
+        return _read_binary_datetime(data, pos, a)
+    if kind == _BINARY_TIME:
+        return _read_binary_time(data, pos)
+    length, pos = _read_lenenc_from(data, pos)
+    value = data[pos:pos+length]
+    pos += length
+    if a is not None:
+        value = str(value, a)
+    else:
+        value = value.tobytes()
+    if b is not None:
+        value = b(value)
+    return value, pos
+
+
+def _read_lenenc_from(data, pos):
+    """Read a length coded integer at data[pos], which must not be NULL.
+
+    Returns the integer and the position after it.
+    """
+    c = data[pos]
+    if c < UNSIGNED_CHAR_COLUMN:
+        return c, pos + 1
+    if c == UNSIGNED_SHORT_COLUMN:
+        return data[pos+1] | data[pos+2] << 8, pos + 3
+    if c == UNSIGNED_INT24_COLUMN:
+        return int.from_bytes(data[pos+1:pos+4], 'little'), pos + 4
+    return int.from_bytes(data[pos+1:pos+9], 'little'), pos + 9
+
+
+def _text_value_decoder(encoding, converter):
+    """Return a function turning the raw bytes of a text protocol value
+    into its Python value."""
+    if encoding is None:
+        return converter or bytes
+    if encoding == 'ascii' and converter in (int, float):
+        # both parse ASCII bytes directly
+        return converter
+    if converter is None:
+        return partial(str, encoding=encoding)
+
+    def decode(data):
+        return converter(str(data, encoding))
+    return decode
+
+
+def _read_text_row(data, decoders):
+    """Decode a text protocol row, applying decoders[i] to column i."""
+    # Slicing bytes is cheaper than slicing the memoryview and
+    # converting each value.
+    data = data.tobytes()
+    row = []
+    pos = 0
+    try:
+        for decode in decoders:
+            length = data[pos]
+            if length < NULL_COLUMN:
+                pos += 1
+            elif length == NULL_COLUMN:
+                pos += 1
+                row.append(None)
+                continue
+            else:
+                length, pos = _read_lenenc_from(data, pos)
+            end = pos + length
+            row.append(decode(data[pos:end]))
+            pos = end
+    except IndexError:
+        # No more columns in this row
+        pass
+    return tuple(row)
+
+
+def _read_text_columns(data, columns):
+    """Append the values of a text protocol row to columns.
+
+    columns holds an (append value, append NULL flag, decoder, NULL value)
+    tuple for each column.
+    """
+    data = data.tobytes()
+    pos = 0
+    for append, append_null, decode, null in columns:
+        length = data[pos]
+        if length < NULL_COLUMN:
+            pos += 1
+        elif length == NULL_COLUMN:
+            pos += 1
+            append(null)
+            append_null(1)
+            continue
+        else:
+            length, pos = _read_lenenc_from(data, pos)
+        end = pos + length
+        append(decode(data[pos:end]))
+        append_null(0)
+        pos = end
+
+
+def _read_text_str_row(data, count, encoding):
+    """Decode a text protocol row of strings sharing one encoding."""
+    data = data.tobytes()
+    row = []
+    pos = 0
+    try:
+        for i in range(count):
+            length = data[pos]
+            if length < NULL_COLUMN:
+                pos += 1
+            elif length == NULL_COLUMN:
+                pos += 1
+                row.append(None)
+                continue
+            else:
+                length, pos = _read_lenenc_from(data, pos)
+            end = pos + length
+            row.append(data[pos:end].decode(encoding))
+            pos = end
+    except IndexError:
+        # No more columns in this row
+        pass
+    return tuple(row)
+
+
+def _read_text_bytes_row(data, count):
+    """Decode a text protocol row into the bytes of its values."""
+    data = data.tobytes()
+    row = []
+    pos = 0
+    try:
+        for i in range(count):
+            length = data[pos]
+            if length < NULL_COLUMN:
+                pos += 1
+            elif length == NULL_COLUMN:
+                pos += 1
+                row.append(None)
+                continue
+            else:
+                length, pos = _read_lenenc_from(data, pos)
+            end = pos + length
+            row.append(data[pos:end])
+            pos = end
+    except IndexError:
+        # No more columns in this row
+        pass
+    return tuple(row)
+
+
+_NUL = re.compile(b'\0')
+
+#: struct format characters of fixed width binary values, signed and unsigned.
+#: They are the same as the array typecodes of column buffers.
+_BINARY_FORMATS = NUMERIC_TYPECODES
+
+# how a column of a binary row is decoded, see MySQLResult._prepare_binary_decoder
+_BINARY_FIXED = 0
+_BINARY_DATETIME = 1
+_BINARY_TIME = 2
+_BINARY_STRING = 3
+
 class MysqlPacket(object):
     """Representation of a MySQL response packet.
 
     Provides an interface for reading/parsing the packet results.
+
+    The payload is held as a memoryview, usually over the connection's
+    receive buffer, so reading values from it does not copy anything.
     """
     __slots__ = ('_position', '_data')
 
     def __init__(self, data, encoding):
         self._position = 0
+        if type(data) is not memoryview:
+            data = memoryview(data)
         self._data = data
 
     def get_all_data(self):
-        return self._data
+        return self._data.tobytes()
 
     def read(self, size):
-        """Read the first 'size' bytes in packet and advance cursor past them."""
+        """Read the first 'size' bytes in packet and advance cursor past them.
+
+        Returns a memoryview into the packet data.
+        """
         result = self._data[self._position:(self._position+size)]
         if len(result) != size:
             error = ('Result length not requested length:\n'
@@ -231,7 +514,7 @@ class MysqlPacket(object):
 
         (Subsequent read() will return errors.)
         """
-        result = self._data[self._position:]
+        result = self._data[self._position:].tobytes()
         self._position = None  # ensure no subsequent read()
         return result
 
@@ -256,7 +539,7 @@ class MysqlPacket(object):
         included) starting at index '0'.
 
         No error checking is done.  If requesting outside end of buffer
-        an empty string (or string shorter than 'length') may be returned!
+        an empty view (or a view shorter than 'length') may be returned!
         """
         return self._data[position:(position+length)]
 
@@ -286,10 +569,12 @@ class MysqlPacket(object):
         return result
 
     def read_string(self):
-        end_pos = self._data.find(b'\0', self._position)
-        if end_pos < 0:
+        # memoryview has no find(), but regexes search it without a copy
+        match = _NUL.search(self._data, self._position)
+        if match is None:
             return None
-        result = self._data[self._position:end_pos]
+        end_pos = match.start()
+        result = self._data[self._position:end_pos].tobytes()
         self._position = end_pos + 1
         return result
 
@@ -317,6 +602,8 @@ class MysqlPacket(object):
         A 'Length Coded String' consists first of a length coded
         (unsigned, positive) integer represented in 1-9 bytes followed by
         that many bytes of binary data.  (For example "cat" would be "3cat".)
+
+        Returns a memoryview into the packet data, or None for NULL.
         """
         length = self.read_length_encoded_integer()
         if length is None:
@@ -339,12 +626,19 @@ class MysqlPacket(object):
         # If \xFE is LengthEncodedInteger header, 8bytes followed.
         return self._data[0:1] == b'\xfe' and len(self._data) < 9
 
+    def is_eof_ok_packet(self):
+        # https://dev.mysql.com/doc/internals/en/packet-OK_Packet.html
+        # With CLIENT.DEPRECATE_EOF, an OK packet with a \xFE header
+        # replaces the EOF packet at the end of a result set.
+        # Rows starting with \xFE are at least MAX_PACKET_LEN long.
+        return self._data[0:1] == b'\xfe' and len(self._data) < MAX_PACKET_LEN
+
     def is_auth_switch_request(self):
         # http://dev.mysql.com/doc/internals/en/connection-phase-packets.html#packet-Protocol::AuthSwitchRequest
         return self._data[0:1] == b'\xfe'
 
     def is_resultset_packet(self):
-        field_count = ord(self._data[0:1])
+        field_count = self._data[0]
         return 1 <= field_count <= 250
 
     def is_load_local_packet(self):
@@ -359,10 +653,10 @@ class MysqlPacket(object):
             self.advance(1)  # field_count == error (we already know that)
             errno = self.read_uint16()
             if DEBUG: print("errno =", errno)
-            err.raise_mysql_exception(self._data)
+            err.raise_mysql_exception(self._data.tobytes())
 
     def dump(self):
-        dump_packet(self._data)
+        dump_packet(self._data.tobytes())
 
 
 class FieldDescriptorPacket(MysqlPacket):
@@ -381,16 +675,19 @@ class FieldDescriptorPacket(MysqlPacket):
 
         This is compatible with MySQL 4.1+ (not compatible with MySQL 4.0).
         """
-        self.catalog = self.read_length_coded_string()
-        self.db = self.read_length_coded_string()
-        self.table_name = self.read_length_coded_string().decode(encoding)
-        self.org_table = self.read_length_coded_string().decode(encoding)
-        self.name = self.read_length_coded_string().decode(encoding)
-        self.org_name = self.read_length_coded_string().decode(encoding)
+        self.catalog = self.read_length_coded_string().tobytes()
+        self.db = self.read_length_coded_string().tobytes()
+        self.table_name = str(self.read_length_coded_string(), encoding)
+        self.org_table = str(self.read_length_coded_string(), encoding)
+        self.name = str(self.read_length_coded_string(), encoding)
+        self.org_name = str(self.read_length_coded_string(), encoding)
         self.charsetnr, self.length, self.type_code, self.flags, self.scale = (
             self.read_struct('<xHIBHBxx'))
         # 'default' is a length coded binary and is still in the buffer?
         # not used for normal result sets...
+        # descriptors outlive the read (result fields, cached results), so
+        # they must not keep the connection's receive buffer alive
+        self._data = memoryview(self._data.tobytes())
 
     def description(self):
         """Provides a 7-item tuple compatible with the Python PEP249 DB Spec."""
@@ -423,7 +720,7 @@ class OKPacketWrapper(object):
     """
 
     def __init__(self, from_packet):
-        if not from_packet.is_ok_packet():
+        if not (from_packet.is_ok_packet() or from_packet.is_eof_ok_packet()):
             raise ValueError('Cannot create ' + str(self.__class__.__name__) +
                              ' object from invalid packet type')
 
@@ -522,12 +819,28 @@ class Connection(object):
         A dict of arguments similar to mysql_ssl_set()'s parameters.
         For now the capath and cipher arguments are not supported.
     :param read_default_group: Group to read from in the configuration file.
-    :param compress: Not supported
+    :param compress: Use the compressed protocol if the server supports it. (default: False)
+    :param compress_min_size: Packets shorter than this are sent uncompressed. (default: 50)
+    :param compress_thread_size: Frames of at least this many bytes are compressed and
+        decompressed in a worker thread, so that the event loop is not blocked.
+        None means never. (default: None)
     :param named_pipe: Not supported
     :param autocommit: Autocommit mode. None means use server default. (default: False)
     :param local_infile: Boolean to enable the use of LOAD DATA LOCAL command. (default: False)
     :param max_allowed_packet: Max size of packet sent to server in bytes. (default: 16MB)
-        Only used to limit size of "LOAD LOCAL INFILE" data packet smaller than default (16KB).
+        Only used to limit the size of "LOAD LOCAL INFILE" data packets.
+    :param local_infile_packet_size: Size of "LOAD LOCAL INFILE" data packets, up to
+        max_allowed_packet. Larger packets upload faster, but the server rejects
+        those larger than its own max_allowed_packet, which is 4MB by default
+        in MySQL 5.7. (default: 16KB)
+    :param result_cache: A :class:`~trio_mysql.cache.ResultCache` in which cursors keep
+        the results of queries executed with a ``cache_ttl``. (default: None)
+    :param local_infile_progress: Function called after each data packet of a
+        "LOAD LOCAL INFILE" upload, with the number of bytes sent so far and the
+        throughput in bytes per second. (default: None)
+    :param read_buffer_size: Number of bytes requested from the socket at once. Whole
+        packets are then parsed from this buffer without going back to the network.
+        (default: 64KB)
     :param auth_plugin_map: A dict of plugin names to a class that processes that plugin.
         The class will take the Connection object as the argument to the constructor.
         The class needs an async ``authenticate`` method taking an authentication packet as
@@ -536,6 +849,8 @@ class Connection(object):
     :param db: Alias for database. (for compatibility to MySQLdb)
     :param passwd: Alias for password. (for compatibility to MySQLdb)
     :param binary_prefix: Add _binary prefix on bytes and bytearray. (default: False)
+    :param prepared_cache_size: Number of server-side prepared statements kept open per
+        connection. The least recently used one is closed when the cache is full. (default: 64)
 
     See `Connection <https://www.python.org/dev/peps/pep-0249/#connection-objects>`_ in the
     specification.
@@ -563,7 +878,11 @@ class Connection(object):
                  autocommit=False, db=None, passwd=None, local_infile=False,
                  max_allowed_packet=16*1024*1024, 
                  auth_plugin_map={}, read_timeout=None, write_timeout=None,
-                 bind_address=None, binary_prefix=False):
+                 bind_address=None, binary_prefix=False,
+                 read_buffer_size=64*1024, compress_min_size=50,
+                 compress_thread_size=None, prepared_cache_size=64,
+                 local_infile_progress=None, result_cache=None,
+                 local_infile_packet_size=16*1024):
         if no_delay is not None:
             warnings.warn("no_delay option is deprecated", DeprecationWarning)
 
@@ -575,12 +894,23 @@ class Connection(object):
         if passwd is not None and not password:
             password = passwd
 
-        if compress or named_pipe:
-            raise NotImplementedError("compress and named_pipe arguments are not supported")
+        if named_pipe:
+            raise NotImplementedError("named_pipe argument is not supported")
+
+        if compress:
+            client_flag |= CLIENT.COMPRESS
+        self._compress_min_size = compress_min_size
+        self._compress_thread_size = compress_thread_size
+        self._compressed = False
 
         self._local_infile = bool(local_infile)
         if self._local_infile:
             client_flag |= CLIENT.LOCAL_FILES
+        # rows sent in place of the file requested by LOAD DATA LOCAL,
+        # see Cursor.load_rows()
+        self._load_local_rows = None
+        self._local_infile_progress = local_infile_progress
+        self.local_infile_packet_size = local_infile_packet_size
 
         if read_default_group and not read_default_file:
             if sys.platform.startswith("win"):
@@ -632,6 +962,8 @@ class Connection(object):
         self.user = user or DEFAULT_USER
         self.password = password or ""
         self.db = database
+        # the database selected by connecting or select_db()
+        self._current_db = None
         self.unix_socket = unix_socket
         self.bind_address = bind_address
         if not (0 < connect_timeout <= 31536000):
@@ -666,6 +998,14 @@ class Connection(object):
         self._affected_rows = 0
         self.host_info = "Not connected"
 
+        self.result_cache = result_cache
+
+        self._query_listeners = []
+        self._trace = None
+        # totals over the lifetime of the connection, used by query traces
+        self._bytes_sent = 0
+        self._bytes_received = 0
+
         #: specified autocommit mode. None means use server default.
         self.autocommit_mode = autocommit
 
@@ -680,7 +1020,15 @@ class Connection(object):
         self.max_allowed_packet = max_allowed_packet
         self._auth_plugin_map = auth_plugin_map
         self._binary_prefix = binary_prefix
+        if read_buffer_size <= 0:
+            raise ValueError("read_buffer_size should be > 0")
+        self._read_buffer_size = read_buffer_size
+        if prepared_cache_size < 1:
+            raise ValueError("prepared_cache_size should be >= 1")
+        self._prepared_cache_size = prepared_cache_size
+        self._prepared = collections.OrderedDict()
         self._sock = None
+        self._reset_read_buffer()
 
     def _create_ssl_ctx(self, sslp):
         if isinstance(sslp, ssl.SSLContext):
@@ -724,6 +1072,7 @@ class Connection(object):
         if self._sock is None:
             return
         send_data = struct.pack('<iB', 1, COMMAND.COM_QUIT)
+        self._next_comp_seq_id = 0
         try:
             await self._write_bytes(send_data)
             await self._sock.aclose()
@@ -749,9 +1098,16 @@ class Connection(object):
                 pass
         self._sock = None
         self._closed = True
+        self._reset_read_buffer()
 
     __del__ = _force_close
 
+    def _reset_read_buffer(self):
+        """Discard any data received from the server but not yet parsed."""
+        self._rbuf = memoryview(b'')
+        self._rbuf_pos = 0
+        self._zbuf = bytearray()
+
     async def autocommit(self, value):
         self.autocommit_mode = bool(value)
         current = self.get_autocommit()
@@ -822,6 +1178,9 @@ class Connection(object):
         """
         await self._execute_command(COMMAND.COM_INIT_DB, db)
         await self._read_ok_packet()
+        if isinstance(db, str):
+            db = db.encode(self.encoding)
+        self._current_db = db
 
     def escape(self, obj, mapping=None):
         """Escape whatever value you pass to it.
@@ -856,6 +1215,63 @@ class Connection(object):
             return "'%s'" % (_fast_surrogateescape(s.replace(b"'", b"''")),)
         return converters.escape_bytes(s)
 
+    def _literal_encoder(self, type_):
+        """Return a function escaping values of exactly type type_ like
+        literal() does, but returning bytes in the connection encoding.
+
+        None as type_ gives a function which accepts any value.
+        """
+        encoding = self.encoding
+        literal = self.literal
+        if type_ is str:
+            escape_string = self.escape_string
+            return lambda s: ("'" + escape_string(s) + "'").encode(encoding, 'surrogateescape')
+        if type_ in (bytes, bytearray):
+            prefix = "_binary" if self._binary_prefix else ""
+            quote_bytes = self._quote_bytes
+            return lambda b: (prefix + quote_bytes(b)).encode(encoding, 'surrogateescape')
+        encoder = self.encoders.get(type_)
+        if encoder is converters.escape_int and type_ is int:
+            return b'%d'.__mod__
+        if encoder is converters.escape_float and type_ is float:
+            return b'%.15g'.__mod__
+        if encoder is converters.escape_None:
+            return lambda v: b'NULL'
+        if encoder is None or encoder in (converters.escape_dict, converters.escape_sequence):
+            return lambda v: str(literal(v)).encode(encoding, 'surrogateescape')
+        mapping = self.encoders
+        return lambda v: encoder(v, mapping).encode(encoding, 'surrogateescape')
+
+    def pipeline(self, cursor=None):
+        """
+        Send several queries without waiting for each other's response.
+
+        :param cursor: The type of cursor returned for each query; a buffered
+            cursor class like :py:class:`Cursor` or :py:class:`DictCursor`.
+            None means use the connection's cursorclass.
+        :rtype: trio_mysql.pipeline.Pipeline
+        """
+        return Pipeline(self, cursor or self.cursorclass)
+
+    def add_query_listener(self, listener):
+        """
+        Call listener with a :class:`QueryTrace` after each statement run by
+        :meth:`query` or :meth:`execute_prepared`, i.e. by cursors.
+
+        The listener is called from the task which reads the end of the
+        result, so it must not block. To consume traces in another task,
+        pass the ``send_nowait`` method of a trio memory channel.
+        """
+        self._query_listeners.append(listener)
+
+    def remove_query_listener(self, listener):
+        """Stop calling a listener added by :meth:`add_query_listener`."""
+        self._query_listeners.remove(listener)
+
+    def _new_trace(self, command, query):
+        return QueryTrace(command, query, trio.current_time(),
+                          self._bytes_sent, self._bytes_received)
+
     def cursor(self, cursor=None):
         """
         Create a new cursor to execute queries with.
@@ -880,17 +1296,73 @@ class Connection(object):
             self.commit()
 
     # The following methods are INTERNAL USE ONLY (called from Cursor)
-    async def query(self, sql, unbuffered=False):
+    async def query(self, sql, unbuffered=False, lazy=False, raw=False):
         # if DEBUG:
         #     print("DEBUG: sending query:", sql)
+        trace = None
+        if self._query_listeners:
+            trace = self._new_trace(COMMAND.COM_QUERY, sql)
         if isinstance(sql, str) and not (JYTHON or IRONPYTHON):
             sql = sql.encode(self.encoding, 'surrogateescape')
         await self._execute_command(COMMAND.COM_QUERY, sql)
-        self._affected_rows = await self._read_query_result(unbuffered=unbuffered)
+        if trace is not None:
+            trace.sent = trio.current_time()
+            self._trace = trace
+        self._affected_rows = await self._read_query_result(unbuffered=unbuffered,
+                                                            lazy=lazy, raw=raw)
         return self._affected_rows
 
     async def next_result(self, unbuffered=False):
-        self._affected_rows = await self._read_query_result(unbuffered=unbuffered)
+        binary = self._result is not None and self._result.binary
+        lazy = self._result is not None and self._result.lazy
+        raw = self._result is not None and self._result.raw
+        self._affected_rows = await self._read_query_result(unbuffered=unbuffered,
+                                                            binary=binary, lazy=lazy,
+                                                            raw=raw)
+        return self._affected_rows
+
+    async def prepare(self, sql):
+        """
+        Prepare a statement on the server, or get it from the statement cache.
+
+        :param str sql: Statement to prepare, with ``?`` placeholders.
+        :rtype: PreparedStatement
+        """
+        cache = self._prepared
+        stmt = cache.get(sql)
+        if stmt is not None:
+            cache.move_to_end(sql)
+            return stmt
+
+        await self._execute_command(COMMAND.COM_STMT_PREPARE, sql)
+        stmt = PreparedStatement(await self._read_packet(), sql)
+        # Parameter and column definitions are sent again with each
+        # result set, so they are skipped here.
+        for count in (stmt.param_count, stmt.field_count):
+            for i in range(count):
+                await self._read_packet()
+            if count and not self.client_flag & CLIENT.DEPRECATE_EOF:
+                await self._read_packet()
+
+        cache[sql] = stmt
+        while len(cache) > self._prepared_cache_size:
+            _, evicted = cache.popitem(last=False)
+            await self._execute_command(COMMAND.COM_STMT_CLOSE,
+                                        struct.pack('<I', evicted.statement_id))
+        return stmt
+
+    async def execute_prepared(self, sql, args=(), unbuffered=False, lazy=False):
+        stmt = await self.prepare(sql)
+        trace = None
+        if self._query_listeners:
+            trace = self._new_trace(COMMAND.COM_STMT_EXECUTE, sql)
+        await self._execute_command(COMMAND.COM_STMT_EXECUTE,
+                                    stmt._execute_packet(args, self.encoding))
+        if trace is not None:
+            trace.sent = trio.current_time()
+            self._trace = trace
+        self._affected_rows = await self._read_query_result(unbuffered=unbuffered,
+                                                            binary=True, lazy=lazy)
         return self._affected_rows
 
     def affected_rows(self):
@@ -976,9 +1448,14 @@ class Connection(object):
                 sock = trio.SocketStream(sock)
             self._sock = sock
             self._next_seq_id = 0
+            self._compressed = False
+            self._reset_read_buffer()
+            # prepared statements do not outlive the server session
+            self._prepared.clear()
 
             await self._get_server_information()
             await self._request_authentication()
+            self._current_db = self.db
 
             if self.sql_mode is not None:
                 c = self.cursor()
@@ -1034,59 +1511,169 @@ class Connection(object):
         :raise OperationalError: If the connection to the MySQL server is lost.
         :raise InternalError: If the packet sequence number is wrong.
         """
-        buff = b''
-        while True:
-            packet_header = await self._read_bytes(4)
-            #if DEBUG: dump_packet(packet_header)
-
-            btrl, btrh, packet_number = struct.unpack('<HBB', packet_header)
-            bytes_to_read = btrl + (btrh << 16)
-            if packet_number != self._next_seq_id:
-                self._force_close()
-                if packet_number == 0:
-                    # MariaDB sends error packet with seqno==0 when shutdown
-                    raise err.OperationalError(
-                        CR.CR_SERVER_LOST,
-                        "Lost connection to MySQL server during query")
-                raise err.InternalError(
-                    "Packet sequence number wrong - got %d expected %d"
-                    % (packet_number, self._next_seq_id))
-            self._next_seq_id = (self._next_seq_id + 1) % 256
-
-            recv_data = await self._read_bytes(bytes_to_read)
-            if DEBUG: dump_packet(recv_data)
-            buff += recv_data
-            # https://dev.mysql.com/doc/internals/en/sending-more-than-16mbyte.html
-            if bytes_to_read == 0xffffff:
-                continue
-            if bytes_to_read < MAX_PACKET_LEN:
-                break
+        bytes_to_read = await self._read_frame_header()
+        buff = await self._read_bytes(bytes_to_read)
+        if DEBUG: dump_packet(buff.tobytes())
+        # https://dev.mysql.com/doc/internals/en/sending-more-than-16mbyte.html
+        if bytes_to_read == MAX_PACKET_LEN:
+            # collect all frames and join them once, instead of growing
+            # the payload frame by frame
+            frames = [buff]
+            while bytes_to_read == MAX_PACKET_LEN:
+                bytes_to_read = await self._read_frame_header()
+                frames.append(await self._read_bytes(bytes_to_read))
+            buff = b''.join(frames)
+            del frames
 
         packet = packet_type(buff, self.encoding)
         packet.check_error()
         return packet
 
+    def _read_buffered_packet(self):
+        """Return the payload of the next packet if it was already received,
+        without going to the network.
+
+        :return: a memoryview, or None if the packet is not fully buffered,
+            spans several frames, or has an unexpected sequence number.
+        """
+        buf = self._rbuf
+        pos = self._rbuf_pos
+        if pos + 4 > len(buf):
+            return None
+        btrl, btrh, packet_number = _unpack_frame_header(buf, pos)
+        length = btrl + (btrh << 16)
+        end = pos + 4 + length
+        if end > len(buf) or length == MAX_PACKET_LEN or packet_number != self._next_seq_id:
+            return None
+        self._next_seq_id = (packet_number + 1) % 256
+        self._rbuf_pos = end
+        return buf[pos+4:end]
+
+    async def _read_frame_header(self):
+        """Read the header of the next wire frame and check its sequence number.
+
+        :return: the length of the frame payload.
+        :raise OperationalError: If the connection to the MySQL server is lost.
+        :raise InternalError: If the packet sequence number is wrong.
+        """
+        packet_header = await self._read_bytes(4)
+        #if DEBUG: dump_packet(packet_header)
+
+        btrl, btrh, packet_number = struct.unpack('<HBB', packet_header)
+        if packet_number != self._next_seq_id:
+            self._force_close()
+            if packet_number == 0:
+                # MariaDB sends error packet with seqno==0 when shutdown
+                raise err.OperationalError(
+                    CR.CR_SERVER_LOST,
+                    "Lost connection to MySQL server during query")
+            raise err.InternalError(
+                "Packet sequence number wrong - got %d expected %d"
+                % (packet_number, self._next_seq_id))
+        self._next_seq_id = (self._next_seq_id + 1) % 256
+        return btrl + (btrh << 16)
+
     async def _read_bytes(self, num_bytes):
-        rdata = b""
-        while self._sock is not None and len(rdata) < num_bytes:
+        """Read exactly num_bytes from the server.
+
+        Returns a memoryview, usually sliced from the receive buffer.
+        """
+        pos = self._rbuf_pos
+        end = pos + num_bytes
+        if end <= len(self._rbuf):
+            # fast path: the whole request is already buffered
+            self._rbuf_pos = end
+            return self._rbuf[pos:end]
+
+        parts = [self._rbuf[pos:]]
+        missing = end - len(self._rbuf)
+        # only the receive buffer is used up; compressed frames which
+        # arrived with the last socket read are still pending in _zbuf
+        self._rbuf = memoryview(b'')
+        self._rbuf_pos = 0
+        while missing > 0:
+            data = memoryview(await self._receive_some())
+            if len(data) > missing:
+                # keep the surplus for subsequent reads
+                self._rbuf = data
+                self._rbuf_pos = missing
+                data = data[:missing]
+            parts.append(data)
+            missing -= len(data)
+        return memoryview(b''.join(parts))
+
+    async def _read_some_bytes(self, max_bytes):
+        """Read at least one and at most max_bytes bytes from the server.
+
+        Only goes to the network when nothing is buffered.
+        """
+        if self._rbuf_pos >= len(self._rbuf):
+            self._rbuf = memoryview(await self._receive_some())
+            self._rbuf_pos = 0
+        pos = self._rbuf_pos
+        end = min(len(self._rbuf), pos + max_bytes)
+        self._rbuf_pos = end
+        return self._rbuf[pos:end]
+
+    async def _receive_some(self):
+        """Fetch the next chunk of data from the server.
+
+        With the compressed protocol, this is the uncompressed payload
+        of the next compressed frame.
+
+        :raise OperationalError: If the connection to the MySQL server is lost.
+        """
+        if not self._compressed:
+            return await self._receive_raw()
+        # https://dev.mysql.com/doc/internals/en/compressed-packet-header.html
+        while True:
+            header = await self._read_raw_bytes(7)
+            cl, ch, seq_id, ul, uh = struct.unpack('<HBBHB', header)
+            self._next_comp_seq_id = (seq_id + 1) % 256
+            data = await self._read_raw_bytes(cl + (ch << 16))
+            if ul or uh:
+                data = await self._run_zlib(zlib.decompress, data)
+            if data:
+                return data
+
+    async def _read_raw_bytes(self, num_bytes):
+        """Read exactly num_bytes from the socket, bypassing decompression."""
+        buf = self._zbuf
+        while len(buf) < num_bytes:
+            buf += await self._receive_raw()
+        data = buf[:num_bytes]
+        del buf[:num_bytes]
+        return data
+
+    async def _run_zlib(self, func, data):
+        if self._compress_thread_size is not None and len(data) >= self._compress_thread_size:
+            return await trio.to_thread.run_sync(func, data)
+        return func(data)
+
+    async def _receive_raw(self):
+        data = b""
+        if self._sock is not None:
             try:
-                data = await self._sock.receive_some(num_bytes-len(rdata))
+                data = await self._sock.receive_some(self._read_buffer_size)
             except trio.BrokenStreamError as e:
                 self._force_close()
                 raise err.OperationalError(
                     CR.CR_SERVER_LOST,
                     "Lost connection to MySQL server during query (%s)" % (e,))
-            else:
-                if data == b"":
-                    break
-                rdata += data
-        if len(rdata) < num_bytes:
+        if data == b"":
             self._force_close()
             raise err.OperationalError(
                 CR.CR_SERVER_LOST, "Lost connection to MySQL server during query")
-        return rdata
+        self._bytes_received += len(data)
+        return data
 
     async def _write_bytes(self, data):
+        if self._compressed:
+            data = await self._compress_frames(data)
+        await self._send_all(data)
+
+    async def _send_all(self, data):
+        """Send data which is already framed for the wire."""
         try:
             await self._sock.send_all(data)
         except trio.BrokenStreamError as e:
@@ -1094,18 +1681,40 @@ class Connection(object):
             raise err.OperationalError(
                 CR.CR_SERVER_GONE_ERROR,
                 "MySQL server has gone away (%r)" % (e,))
+        self._bytes_sent += len(data)
 
-    async def _read_query_result(self, unbuffered=False):
+    async def _compress_frames(self, data):
+        """Wrap data into compressed protocol frames."""
+        frames = []
+        data = memoryview(data)
+        offset = 0
+        while True:
+            chunk = data[offset:offset+MAX_PACKET_LEN]
+            offset += len(chunk)
+            payload, uncomp_length = chunk, 0
+            if len(chunk) >= self._compress_min_size:
+                compressed = await self._run_zlib(zlib.compress, chunk)
+                if len(compressed) < len(chunk):
+                    payload, uncomp_length = compressed, len(chunk)
+            frames.append(pack_int24(len(payload)) + int2byte(self._next_comp_seq_id) +
+                          pack_int24(uncomp_length))
+            frames.append(payload)
+            self._next_comp_seq_id = (self._next_comp_seq_id + 1) % 256
+            if offset >= len(data):
+                return b''.join(frames)
+
+    async def _read_query_result(self, unbuffered=False, binary=False, lazy=False,
+                                 raw=False):
         if unbuffered:
             try:
-                result = MySQLResult(self)
+                result = MySQLResult(self, binary, lazy, raw)
                 await result.init_unbuffered_query()
             except:
                 result.unbuffered_active = False
                 result.connection = None
                 raise
         else:
-            result = MySQLResult(self)
+            result = MySQLResult(self, binary, lazy, raw)
             await result.read()
         self._result = result
         if result.server_status is not None:
@@ -1118,12 +1727,10 @@ class Connection(object):
         else:
             return 0
 
-    async def _execute_command(self, command, sql):
+    async def _finish_previous_result(self):
         """
         :raise InterfaceError: If the connection is closed.
-        :raise ValueError: If no username was specified.
         """
-        
         if not self._sock:
             raise err.InterfaceError("This connection is closed")
 
@@ -1134,9 +1741,43 @@ class Connection(object):
                 warnings.warn("Previous unbuffered result was left incomplete")
                 await self._result._finish_unbuffered_query()
             while self._result.has_next:
-                self.next_result()
+                await self.next_result()
             self._result = None
 
+    async def _command_bytes(self, command, sql):
+        """Frame a whole command the way the server expects it on the wire.
+
+        Used to send several commands at once; the sequence numbers start
+        at 0 like with :meth:`_execute_command`.
+        """
+        if isinstance(sql, str):
+            sql = sql.encode(self.encoding, 'surrogateescape')
+        data = memoryview(int2byte(command) + sql)
+        parts = []
+        seq_id = 0
+        offset = 0
+        while True:
+            chunk = data[offset:offset+MAX_PACKET_LEN]
+            parts.append(pack_int24(len(chunk)) + int2byte(seq_id))
+            parts.append(chunk)
+            seq_id = (seq_id + 1) % 256
+            offset += len(chunk)
+            if len(chunk) < MAX_PACKET_LEN:
+                break
+        data = b''.join(parts)
+        if self._compressed:
+            self._next_comp_seq_id = 0
+            data = await self._compress_frames(data)
+        return data
+
+    async def _execute_command(self, command, sql):
+        """
+        :raise InterfaceError: If the connection is closed.
+        :raise ValueError: If no username was specified.
+        """
+        await self._finish_previous_result()
+        self._trace = None
+
         if isinstance(sql, str):
             sql = sql.encode(self.encoding)
 
@@ -1146,6 +1787,7 @@ class Connection(object):
         # calling self..write_packet()
         prelude = struct.pack('<iB', packet_size, command)
         packet = prelude + sql[:packet_size-1]
+        self._next_comp_seq_id = 0
         await self._write_bytes(packet)
         if DEBUG: dump_packet(packet)
         self._next_seq_id = 1
@@ -1153,12 +1795,14 @@ class Connection(object):
         if packet_size < MAX_PACKET_LEN:
             return
 
-        sql = sql[packet_size-1:]
+        # walk the rest with offsets into a view instead of re-slicing sql
+        sql = memoryview(sql)
+        offset = packet_size - 1
         while True:
-            packet_size = min(MAX_PACKET_LEN, len(sql))
-            await self.write_packet(sql[:packet_size])
-            sql = sql[packet_size:]
-            if not sql and packet_size < MAX_PACKET_LEN:
+            packet_size = min(MAX_PACKET_LEN, len(sql) - offset)
+            await self.write_packet(sql[offset:offset+packet_size])
+            offset += packet_size
+            if offset == len(sql) and packet_size < MAX_PACKET_LEN:
                 break
 
     async def _request_authentication(self):
@@ -1173,6 +1817,11 @@ class Connection(object):
         if isinstance(self.user, str):
             self.user = self.user.encode(self.encoding)
 
+        if not self.server_capabilities & CLIENT.DEPRECATE_EOF:
+            self.client_flag &= ~CLIENT.DEPRECATE_EOF
+        if not self.server_capabilities & CLIENT.COMPRESS:
+            self.client_flag &= ~CLIENT.COMPRESS
+
         data_init = struct.pack('<iIB23s', self.client_flag, 1, charset_id, b'')
 
         if self.ssl and self.server_capabilities & CLIENT.SSL:
@@ -1222,6 +1871,10 @@ class Connection(object):
                 await self.write_packet(data)
                 auth_packet = await self._read_packet()
 
+        # everything after the authentication result is compressed
+        self._compressed = bool(self.client_flag & CLIENT.COMPRESS)
+        self._next_comp_seq_id = 0
+
     async def _process_auth(self, plugin_name, auth_packet):
         plugin_class = self._auth_plugin_map.get(plugin_name)
         if not plugin_class:
@@ -1375,13 +2028,273 @@ class Connection(object):
     NotSupportedError = err.NotSupportedError
 
 
+class PreparedStatement(object):
+    """
+    A statement prepared on the server with COM_STMT_PREPARE.
+
+    Instances are created and cached by :meth:`Connection.prepare`.
+    """
+
+    def __init__(self, packet, sql):
+        # https://dev.mysql.com/doc/internals/en/com-stmt-prepare-response.html
+        self.sql = sql
+        (self.statement_id, self.field_count, self.param_count,
+         self.warning_count) = packet.read_struct('<xIHHxH')
+
+    def _execute_packet(self, args, encoding):
+        if len(args) != self.param_count:
+            raise err.ProgrammingError(
+                "Statement takes %d parameters, %d given" % (self.param_count, len(args)))
+        # no cursor, one iteration
+        data = bytearray(struct.pack('<IBI', self.statement_id, 0, 1))
+        if not args:
+            return data
+        null_bitmap = bytearray((len(args) + 7) // 8)
+        types = bytearray()
+        values = bytearray()
+        for i, arg in enumerate(args):
+            if arg is None:
+                null_bitmap[i >> 3] |= 1 << (i & 7)
+                types += b'\x06\x00'
+                continue
+            type_code, type_flags, value = _pack_binary_param(arg, encoding)
+            types.append(type_code)
+            types.append(type_flags)
+            values += value
+        data += null_bitmap
+        data.append(1)  # new-params-bound flag
+        data += types
+        data += values
+        return data
+
+
+class QueryTrace(object):
+    """
+    The timeline of one statement, passed to the listeners added with
+    :meth:`Connection.add_query_listener` once its result has been read.
+
+    Times are in seconds, from :func:`trio.current_time`.
+    ``first_packet - sent`` is mostly server time plus a network round trip,
+    ``finished - first_packet`` mostly transfer time. Each result of a
+    multi-statement query gets its own trace, starting when the previous
+    one finished.
+
+    For pipelined queries, ``sent`` is None and the byte counts overlap
+    with those of the other queries in the pipeline. Byte counts are
+    measured on the socket, so they include protocol overhead, and are
+    compressed when the connection uses compression.
+    """
+
+    #: :data:`~trio_mysql.constants.COMMAND.COM_QUERY` or
+    #: :data:`~trio_mysql.constants.COMMAND.COM_STMT_EXECUTE`
+    command = None
+    #: The SQL of the query or prepared statement, as passed by the caller
+    query = None
+    #: When the command started being sent
+    started = None
+    #: When the command was sent
+    sent = None
+    #: When the first packet of the response was read
+    first_packet = None
+    #: When the column definitions were read, None if there is no result set
+    fields_read = None
+    #: When the last packet of the response was read
+    finished = None
+    #: Number of rows received
+    rows = 0
+    bytes_sent = 0
+    bytes_received = 0
+    #: None for result sets
+    affected_rows = None
+    insert_id = None
+    server_status = None
+    warning_count = 0
+    #: The :class:`~trio_mysql.err.MySQLError` raised for the statement, if any
+    error = None
+
+    def __init__(self, command, query, started, bytes_sent=0, bytes_received=0):
+        self.command = command
+        self.query = query
+        self.started = started
+        # connection totals when the trace started, until it finishes
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+
+    @property
+    def duration(self):
+        return self.finished - self.started
+
+    def __repr__(self):
+        return "<QueryTrace %r rows=%d duration=%.6f>" % (
+            self.query, self.rows, self.duration)
+
+
+_UNDECODED = object()
+
+
+class LazyRow(collections.abc.Sequence):
+    """
+    A row whose values are only decoded when they are read.
+
+    Returned by :class:`~trio_mysql.cursors.LazyCursor` and
+    :class:`~trio_mysql.cursors.SSLazyCursor`. The row keeps the bytes of
+    its packet, and each value is decoded and converted the first time it
+    is read, then kept. Otherwise it works like a tuple: it can be indexed,
+    sliced, iterated, hashed and compared to tuples, and it pickles as a
+    tuple.
+    """
+
+    __slots__ = ('_data', '_layout', '_offsets', '_values')
+
+    def __init__(self, data, layout):
+        self._data = bytes(data)
+        self._layout = layout
+        self._offsets = None
+        self._values = None
+
+    def _scan(self):
+        offsets = self._offsets = self._layout.offsets(self._data)
+        self._values = [_UNDECODED] * len(offsets)
+
+    def __getitem__(self, index):
+        if self._values is None:
+            self._scan()
+        values = self._values
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(values))))
+        value = values[index]
+        if value is _UNDECODED:
+            if index < 0:
+                index += len(values)
+            value = values[index] = self._layout.decode(
+                self._data, self._offsets[index], index)
+        return value
+
+    def __len__(self):
+        if self._values is None:
+            self._scan()
+        return len(self._values)
+
+    def __iter__(self):
+        read_row = self._layout.read_row
+        if self._values is None and read_row is not None:
+            # decoding the whole row at once is faster than value by value
+            values = read_row(memoryview(self._data))
+            self._values = list(values)
+            self._data = None
+            return iter(values)
+        return (self[i] for i in range(len(self)))
+
+    def __eq__(self, other):
+        if isinstance(other, (tuple, LazyRow)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return 'LazyRow(%r)' % (tuple(self),)
+
+    def __reduce__(self):
+        return tuple, (tuple(self),)
+
+
+class _LazyTextLayout(object):
+    """Finds and decodes the values of text protocol rows, for LazyRow."""
+
+    def __init__(self, decoders, read_row):
+        self.decoders = decoders
+        #: decodes a whole row, like MySQLResult._read_text_row
+        self.read_row = read_row
+
+    def offsets(self, data):
+        """Return the position of each value in data, or -1 for NULL."""
+        offsets = []
+        pos = 0
+        end = len(data)
+        for i in range(len(self.decoders)):
+            if pos >= end:
+                # No more columns in this row
+                break
+            length = data[pos]
+            if length < NULL_COLUMN:
+                offsets.append(pos)
+                pos += 1 + length
+            elif length == NULL_COLUMN:
+                offsets.append(-1)
+                pos += 1
+            else:
+                offsets.append(pos)
+                length, pos = _read_lenenc_from(data, pos)
+                pos += length
+        return offsets
+
+    def decode(self, data, pos, i):
+        if pos < 0:
+            return None
+        length, pos = _read_lenenc_from(data, pos)
+        return self.decoders[i](data[pos:pos+length])
+
+
+class _LazyBinaryLayout(object):
+    """Finds and decodes the values of binary protocol rows, for LazyRow."""
+
+    # MySQLResult._read_binary_row would keep the result alive
+    read_row = None
+
+    def __init__(self, columns, values_offset):
+        self.columns = columns
+        self.values_offset = values_offset
+
+    def offsets(self, data):
+        """Return the position of each value in data, or -1 for NULL."""
+        pos = self.values_offset
+        nulls = int.from_bytes(data[1:pos], 'little') >> 2
+        offsets = []
+        for kind, a, b in self.columns:
+            if nulls & 1:
+                offsets.append(-1)
+            else:
+                offsets.append(pos)
+                if kind == _BINARY_FIXED:
+                    pos += b
+                elif kind == _BINARY_STRING:
+                    length, pos = _read_lenenc_from(data, pos)
+                    pos += length
+                else:
+                    # dates and times start with their length
+                    pos += 1 + data[pos]
+            nulls >>= 1
+        return offsets
+
+    def decode(self, data, pos, i):
+        if pos < 0:
+            return None
+        kind, a, b = self.columns[i]
+        if kind == _BINARY_FIXED:
+            return a(data, pos)[0]
+        return _read_binary_value(memoryview(data), pos, kind, a, b)[0]
+
+
 class MySQLResult(object):
 
-    def __init__(self, connection):
+    def __init__(self, connection, binary=False, lazy=False, raw=False):
         """
         :type connection: Connection
+        :param binary: Rows use the binary protocol (results of COM_STMT_EXECUTE).
+        :param lazy: Rows are :class:`LazyRow` objects.
+        :param raw: Values are left as the bytes the server sent, without
+            decoding or converting them.
         """
         self.connection = connection
+        # the trace of the statement, only set when somebody is listening
+        self._trace = connection._trace
+        connection._trace = None
+        self._row_count = 0
+        self.binary = binary
+        self.lazy = lazy
+        self.raw = raw
         self.affected_rows = None
         self.insert_id = None
         self.server_status = None
@@ -1392,6 +2305,8 @@ class MySQLResult(object):
         self.rows = None
         self.has_next = None
         self.unbuffered_active = False
+        self._value_stream = None
+        self._deprecate_eof = connection.client_flag & CLIENT.DEPRECATE_EOF
 
     def __del__(self):
         if self.unbuffered_active:
@@ -1401,6 +2316,8 @@ class MySQLResult(object):
     async def read(self):
         try:
             first_packet = await self.connection._read_packet()
+            if self._trace is not None:
+                self._trace.first_packet = trio.current_time()
 
             if first_packet.is_ok_packet():
                 self._read_ok_packet(first_packet)
@@ -1408,6 +2325,13 @@ class MySQLResult(object):
                 await self._read_load_local_packet(first_packet)
             else:
                 await self._read_result_packet(first_packet)
+        except err.MySQLError as e:
+            if self._trace is not None and self.connection is not None:
+                self._end_trace(e)
+            raise
+        else:
+            if self._trace is not None:
+                self._end_trace()
         finally:
             self.connection = None
 
@@ -1417,23 +2341,58 @@ class MySQLResult(object):
         :raise InternalError:
         """
         self.unbuffered_active = True
-        first_packet = await self.connection._read_packet()
+        try:
+            first_packet = await self.connection._read_packet()
+            if self._trace is not None:
+                self._trace.first_packet = trio.current_time()
 
-        if first_packet.is_ok_packet():
-            self._read_ok_packet(first_packet)
-            self.unbuffered_active = False
-            self.connection = None
-        elif first_packet.is_load_local_packet():
-            await self._read_load_local_packet(first_packet)
-            self.unbuffered_active = False
-            self.connection = None
-        else:
-            self.field_count = first_packet.read_length_encoded_integer()
-            await self._get_descriptions()
+            if first_packet.is_ok_packet():
+                self._read_ok_packet(first_packet)
+                self._end_unbuffered()
+            elif first_packet.is_load_local_packet():
+                await self._read_load_local_packet(first_packet)
+                self._end_unbuffered()
+            else:
+                self.field_count = first_packet.read_length_encoded_integer()
+                await self._get_descriptions()
+
+                # MySQLdb picks 2^64-1 as the max value of a 64bit unsigned integer.
+                # PyMySQL decided to emulate MySQLdb to that extent. We do not.
+                self.affected_rows = None
+        except err.MySQLError as e:
+            if self._trace is not None and self.connection is not None:
+                self._end_trace(e)
+            raise
 
-            # MySQLdb picks 2^64-1 as the max value of a 64bit unsigned integer.
-            # PyMySQL decided to emulate MySQLdb to that extent. We do not.
-            self.affected_rows = None
+    def _end_unbuffered(self):
+        """Mark the end of an unbuffered result."""
+        self.unbuffered_active = False
+        if self.server_status is not None:
+            self.connection.server_status = self.server_status
+        if self._trace is not None:
+            self._end_trace()
+        self.connection = None  # release reference to kill cyclic reference.
+
+    def _end_trace(self, error=None):
+        """Complete the trace of the statement and pass it to the listeners."""
+        trace, self._trace = self._trace, None
+        conn = self.connection
+        trace.finished = trio.current_time()
+        trace.rows = self._row_count
+        trace.bytes_sent = conn._bytes_sent - trace.bytes_sent
+        trace.bytes_received = conn._bytes_received - trace.bytes_received
+        if not self.field_count:
+            trace.affected_rows = self.affected_rows
+        trace.insert_id = self.insert_id
+        trace.server_status = self.server_status
+        trace.warning_count = self.warning_count
+        trace.error = error
+        if self.has_next and error is None:
+            # the next result is traced on its own
+            conn._trace = conn._new_trace(trace.command, trace.query)
+            conn._trace.started = conn._trace.sent = trace.finished
+        for listener in list(conn._query_listeners):
+            listener(trace)
 
     def _read_ok_packet(self, first_packet):
         ok_packet = OKPacketWrapper(first_packet)
@@ -1449,11 +2408,15 @@ class MySQLResult(object):
             raise RuntimeError(
                 "**WARN**: Received LOAD_LOCAL packet but local_infile option is false.")
         load_packet = LoadLocalPacketWrapper(first_packet)
-        sender = LoadLocalFile(load_packet.filename, self.connection)
+        if self.connection._load_local_rows is not None:
+            sender = LoadLocalRows(self.connection._load_local_rows, self.connection)
+        else:
+            sender = LoadLocalFile(load_packet.filename, self.connection)
         try:
             await sender.send_data()
         except:
-            await self.connection._read_packet()  # skip ok packet
+            if self.connection._sock is not None:
+                await self.connection._read_packet()  # skip ok packet
             raise
 
         ok_packet = await self.connection._read_packet()
@@ -1462,13 +2425,19 @@ class MySQLResult(object):
         self._read_ok_packet(ok_packet)
 
     def _check_packet_is_eof(self, packet):
+        if self._deprecate_eof:
+            if not packet.is_eof_ok_packet():
+                return False
+            ok_packet = OKPacketWrapper(packet)
+            self.server_status = ok_packet.server_status
+            self.warning_count = ok_packet.warning_count
+            self.message = ok_packet.message
+            self.has_next = ok_packet.has_next
+            return True
         if not packet.is_eof_packet():
             return False
-        #TODO: Support CLIENT.DEPRECATE_EOF
-        # 1) Add DEPRECATE_EOF to CAPABILITIES
-        # 2) Mask CAPABILITIES with server_capabilities
-        # 3) if server_capabilities & CLIENT.DEPRECATE_EOF: use OKPacketWrapper instead of EOFPacketWrapper
         wp = EOFPacketWrapper(packet)
+        self.server_status = wp.server_status
         self.warning_count = wp.warning_count
         self.has_next = wp.has_next
         return True
@@ -1482,29 +2451,126 @@ class MySQLResult(object):
         # Check if in an active query
         if not self.unbuffered_active:
             return
+        if self._value_stream is not None:
+            await self._value_stream.aclose()
 
-        # EOF
-        packet = await self.connection._read_packet()
-        if self._check_packet_is_eof(packet):
-            self.unbuffered_active = False
-            self.connection = None
-            self.rows = None
-            return
+        conn = self.connection
+        data = conn._read_buffered_packet()
+        if data is not None and data[0] < 0xfe:
+            row = self._read_row(data)
+        else:
+            if data is not None:
+                packet = MysqlPacket(data, conn.encoding)
+                packet.check_error()
+            else:
+                packet = await conn._read_packet()
+            # EOF
+            if self._check_packet_is_eof(packet):
+                self._end_unbuffered()
+                self.rows = None
+                return
+            row = self._read_row_from_packet(packet)
 
-        row = self._read_row_from_packet(packet)
+        self._row_count += 1
         self.affected_rows = 1
         self.rows = (row,)  # rows should tuple of row for MySQL-python compatibility.
         return row
 
+    async def _read_rowdata_packets_unbuffered(self, size, max_bytes=None):
+        """Read up to size rows of an unbuffered result.
+
+        Rows which were already received are decoded in one loop, and the
+        network is only waited for when the buffered data runs out.
+
+        :param max_bytes: Also stop once the rows read add up to this many
+            bytes of packet data.
+        :return: a list of rows, shorter than size at the end of the result.
+        """
+        if not self.unbuffered_active:
+            return []
+        if self._value_stream is not None:
+            await self._value_stream.aclose()
+
+        conn = self.connection
+        read_buffered = conn._read_buffered_packet
+        read_row = self._read_row
+        rows = []
+        append = rows.append
+        bytes_left = max_bytes if max_bytes is not None else float('inf')
+        while len(rows) < size and bytes_left > 0:
+            data = read_buffered()
+            if data is not None and data[0] < 0xfe:
+                bytes_left -= len(data)
+                append(read_row(data))
+                continue
+            if data is not None:
+                packet = MysqlPacket(data, conn.encoding)
+                packet.check_error()
+            else:
+                packet = await conn._read_packet()
+            if self._check_packet_is_eof(packet):
+                self._row_count += len(rows)
+                self._end_unbuffered()
+                self.rows = None
+                return rows
+            bytes_left -= len(packet._data)
+            append(self._read_row_from_packet(packet))
+        self._row_count += len(rows)
+        return rows
+
     async def _finish_unbuffered_query(self):
         # After much reading on the MySQL protocol, it appears that there is,
         # in fact, no way to stop MySQL from sending all the data after
         # executing a query, so we just spin, and wait for an EOF packet.
+        if self._value_stream is not None:
+            await self._value_stream.aclose()
         while self.unbuffered_active:
             packet = await self.connection._read_packet()
             if self._check_packet_is_eof(packet):
-                self.unbuffered_active = False
-                self.connection = None  # release reference to kill cyclic reference.
+                self._end_unbuffered()
+            else:
+                self._row_count += 1
+
+    async def _read_value_stream_unbuffered(self):
+        """Start reading the next row of a single-column result piecewise.
+
+        :return: a :class:`ValueStream`, or None at the end of the result set.
+        """
+        if not self.unbuffered_active:
+            return None
+        if self._value_stream is not None:
+            await self._value_stream.aclose()
+
+        conn = self.connection
+        frame_left = await conn._read_frame_header()
+        frame_full = frame_left == MAX_PACKET_LEN
+        head = (await conn._read_bytes(1))[0]
+        frame_left -= 1
+        if head in (0xfe, 0xff) and not frame_full:
+            # EOF or error packet: small, so read it whole
+            packet = MysqlPacket(
+                bytes((head,)) + await conn._read_bytes(frame_left), conn.encoding)
+            packet.check_error()
+            if not self._check_packet_is_eof(packet):
+                raise err.OperationalError(2014, "Command Out of Sync")
+            self._end_unbuffered()
+            self.rows = None
+            return None
+
+        if head == NULL_COLUMN:
+            length = None
+        elif head < UNSIGNED_CHAR_COLUMN:
+            length = head
+        else:
+            size = {UNSIGNED_SHORT_COLUMN: 2, UNSIGNED_INT24_COLUMN: 3,
+                    UNSIGNED_INT64_COLUMN: 8}[head]
+            length = int.from_bytes(await conn._read_bytes(size), 'little')
+            frame_left -= size
+        self._row_count += 1
+        self.affected_rows = 1
+        self.rows = None
+        self._value_stream = ValueStream(self, length, frame_left, frame_full)
+        return self._value_stream
 
     async def _read_rowdata_packet(self):
         """Read a rowdata packet for each data row in the result set."""
@@ -1512,30 +2578,197 @@ class MySQLResult(object):
         while True:
             packet = await self.connection._read_packet()
             if self._check_packet_is_eof(packet):
-                self.connection = None  # release reference to kill cyclic reference.
                 break
             rows.append(self._read_row_from_packet(packet))
 
-        self.affected_rows = len(rows)
+        self._row_count = self.affected_rows = len(rows)
         self.rows = tuple(rows)
 
     def _read_row_from_packet(self, packet):
+        return self._read_row(packet._data)
+
+    def _read_row(self, data):
+        if self.binary:
+            return self._read_binary_row(data)
+        return self._read_text_row(data)
+
+    def _prepare_text_decoder(self):
+        """Build the function decoding the rows of this result set.
+
+        The per-column encoding and converter are folded into one decoder
+        function each, so rows are decoded without checking them per value.
+        Integer columns decode with a bare int(), and a layout of strings
+        sharing an encoding gets a loop of its own.
+        """
+        encodings = set(encoding for encoding, converter in self.converters)
+        if (len(encodings) == 1
+                and all(converter is None for encoding, converter in self.converters)):
+            encoding = encodings.pop()
+            if encoding is None:
+                self._read_text_row = partial(_read_text_bytes_row, count=self.field_count)
+            else:
+                self._read_text_row = partial(
+                    _read_text_str_row, count=self.field_count, encoding=encoding)
+        else:
+            decoders = tuple(_text_value_decoder(encoding, converter)
+                             for encoding, converter in self.converters)
+            self._read_text_row = partial(_read_text_row, decoders=decoders)
+
+    def _prepare_binary_decoder(self):
+        """Precompute how each column of a binary row is decoded.
+
+        Fixed width columns get a struct of their own. If all columns are
+        fixed width, rows without NULLs are decoded by a single struct.
+        """
+        columns = []
+        row_format = '<'
+        for field, (encoding, converter) in zip(self.fields, self.converters):
+            type_code = field.type_code
+            if type_code in _BINARY_FORMATS:
+                fmt = _BINARY_FORMATS[type_code][bool(field.flags & FLAG.UNSIGNED)]
+                s = struct.Struct('<' + fmt)
+                columns.append((_BINARY_FIXED, s.unpack_from, s.size))
+                if row_format is not None:
+                    row_format += fmt
+            else:
+                row_format = None
+                if type_code in (FIELD_TYPE.DATE, FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP):
+                    columns.append((_BINARY_DATETIME, type_code, None))
+                elif type_code == FIELD_TYPE.TIME:
+                    columns.append((_BINARY_TIME, None, None))
+                else:
+                    # everything else is a length coded string, like in text rows
+                    columns.append((_BINARY_STRING, encoding, converter))
+        self._binary_columns = columns
+        self._binary_row_unpack = struct.Struct(row_format).unpack_from if row_format else None
+        # 0x00 header, then the NULL bitmap with an offset of 2 bits
+        self._binary_values_offset = 1 + (self.field_count + 9) // 8
+
+    def _prepare_lazy_rows(self):
+        """Make rows be read as LazyRow objects, which decode their values
+        with the decoders prepared for this result set."""
+        if self.binary:
+            layout = _LazyBinaryLayout(tuple(self._binary_columns),
+                                       self._binary_values_offset)
+        else:
+            layout = _LazyTextLayout(tuple(
+                _text_value_decoder(encoding, converter)
+                for encoding, converter in self.converters), self._read_text_row)
+        self._read_row = partial(LazyRow, layout=layout)
+
+    def _read_binary_row(self, data):
+        # https://dev.mysql.com/doc/internals/en/binary-protocol-resultset-row.html
+        pos = self._binary_values_offset
+        nulls = int.from_bytes(data[1:pos], 'little') >> 2
+        if not nulls and self._binary_row_unpack is not None:
+            return self._binary_row_unpack(data, pos)
         row = []
-        for encoding, converter in self.converters:
-            try:
-                data = packet.read_length_coded_string()
-            except IndexError:
-                # No more columns in this row
-                break
-            if data is not None:
-                if encoding is not None:
-                    data = data.decode(encoding)
-                if DEBUG: print("DEBUG: DATA = ", data)
-                if converter is not None:
-                    data = converter(data)
-            row.append(data)
+        for kind, a, b in self._binary_columns:
+            if nulls & 1:
+                value = None
+            elif kind == _BINARY_FIXED:
+                value = a(data, pos)[0]
+                pos += b
+            else:
+                value, pos = _read_binary_value(data, pos, kind, a, b)
+            nulls >>= 1
+            row.append(value)
         return tuple(row)
 
+    def _read_binary_columns(self, data, columns):
+        """Append the values of a binary protocol row to columns, which
+        extend _binary_columns with the items of _read_text_columns()."""
+        pos = self._binary_values_offset
+        nulls = int.from_bytes(data[1:pos], 'little') >> 2
+        for kind, a, b, append, append_null, null in columns:
+            if nulls & 1:
+                append(null)
+                append_null(1)
+            else:
+                if kind == _BINARY_FIXED:
+                    append(a(data, pos)[0])
+                    pos += b
+                else:
+                    value, pos = _read_binary_value(data, pos, kind, a, b)
+                    append(value)
+                append_null(0)
+            nulls >>= 1
+
+    def _new_columns(self):
+        """Return an empty :class:`~trio_mysql.columns.Column` for each
+        column of the result set.
+
+        Integer and floating point columns decoded by the default converters
+        get an array. Text protocol FLOAT values are stored as doubles, so
+        that they compare equal to the values in rows.
+        """
+        columns = []
+        if not self.field_count:
+            return columns
+        for field, (encoding, converter) in zip(self.fields, self.converters):
+            typecode = None
+            codes = NUMERIC_TYPECODES.get(field.type_code)
+            if codes is not None and (self.binary or converter in (int, float)):
+                typecode = codes[bool(field.flags & FLAG.UNSIGNED)]
+                if typecode == 'f' and not self.binary:
+                    typecode = 'd'
+            columns.append(Column(field.name, field.type_code, typecode))
+        return columns
+
+    def _columns_reader(self, columns):
+        """Return a function appending the values of a row packet's data
+        to columns, as returned by _new_columns()."""
+        items = [(column.values.append, column.nulls.append,
+                  0 if column.values.__class__ is not list else None)
+                 for column in columns]
+        if self.binary:
+            return partial(self._read_binary_columns, columns=tuple(
+                column + item for column, item in zip(self._binary_columns, items)))
+        return partial(_read_text_columns, columns=tuple(
+            (append, append_null, _text_value_decoder(encoding, converter), null)
+            for (append, append_null, null), (encoding, converter)
+            in zip(items, self.converters)))
+
+    async def _read_columns_unbuffered(self, size=None):
+        """Read up to size rows of an unbuffered result, all if size is
+        None, into columns.
+
+        Works like _read_rowdata_packets_unbuffered(), without building
+        the rows.
+
+        :return: a list of :class:`~trio_mysql.columns.Column`.
+        """
+        columns = self._new_columns()
+        if not self.unbuffered_active:
+            return columns
+        if self._value_stream is not None:
+            await self._value_stream.aclose()
+
+        conn = self.connection
+        read_buffered = conn._read_buffered_packet
+        read_columns = self._columns_reader(columns)
+        count = 0
+        if size is None:
+            size = float('inf')
+        while count < size:
+            data = read_buffered()
+            if data is None or data[0] >= 0xfe:
+                if data is not None:
+                    packet = MysqlPacket(data, conn.encoding)
+                    packet.check_error()
+                else:
+                    packet = await conn._read_packet()
+                if self._check_packet_is_eof(packet):
+                    self._row_count += count
+                    self._end_unbuffered()
+                    self.rows = None
+                    return columns
+                data = packet._data
+            read_columns(data)
+            count += 1
+        self._row_count += count
+        return columns
+
     async def _get_descriptions(self):
         """Read a column descriptor packet for each column in the result."""
         self.fields = []
@@ -1549,6 +2782,9 @@ class MySQLResult(object):
             self.fields.append(field)
             description.append(field.description())
             field_type = field.type_code
+            if self.raw:
+                self.converters.append((None, None))
+                continue
             if use_unicode:
                 if field_type == FIELD_TYPE.JSON:
                     # When SELECT from JSON column: charset = binary
@@ -1573,36 +2809,200 @@ class MySQLResult(object):
             if DEBUG: print("DEBUG: field={}, converter={}".format(field, converter))
             self.converters.append((encoding, converter))
 
-        eof_packet = await self.connection._read_packet()
-        assert eof_packet.is_eof_packet(), 'Protocol error, expecting EOF'
+        if not self._deprecate_eof:
+            eof_packet = await self.connection._read_packet()
+            assert eof_packet.is_eof_packet(), 'Protocol error, expecting EOF'
         self.description = tuple(description)
+        if self.binary:
+            self._prepare_binary_decoder()
+        else:
+            self._prepare_text_decoder()
+        if self.lazy:
+            self._prepare_lazy_rows()
+        if self._trace is not None:
+            self._trace.fields_read = trio.current_time()
 
 
-class LoadLocalFile(object):
+class ValueStream(object):
+    """
+    The raw value of a single column, read from the server piecewise.
+
+    Returned by :meth:`trio_mysql.cursors.SSCursor.stream_value`. Iterate
+    over it with ``async for`` to get the value as a series of bytes
+    objects. ``length`` is the total size of the value in bytes, or None
+    for NULL. The stream must be consumed or closed before anything else
+    is read from the connection; this happens automatically when the next
+    row is fetched.
+    """
+
+    def __init__(self, result, length, frame_left, frame_full):
+        self._result = result
+        self._conn = result.connection
+        self.length = length
+        self._value_left = length or 0
+        self._frame_left = frame_left
+        self._frame_full = frame_full
+
+    if sys.version_info < (3,5,2):
+        async def __aiter__(self):
+            return self
+    else:
+        def __aiter__(self):
+            return self
+
+    async def __anext__(self):
+        if not self._value_left:
+            await self.aclose()
+            raise StopAsyncIteration
+        conn = self._conn
+        while not self._frame_left:
+            self._frame_left = await conn._read_frame_header()
+            self._frame_full = self._frame_left == MAX_PACKET_LEN
+        chunk = await conn._read_some_bytes(min(self._frame_left, self._value_left))
+        self._frame_left -= len(chunk)
+        self._value_left -= len(chunk)
+        return chunk.tobytes()
+
+    async def aclose(self):
+        """Skip whatever is left of the value."""
+        if self._result is None:
+            return
+        conn = self._conn
+        while True:
+            while self._frame_left:
+                chunk = await conn._read_some_bytes(self._frame_left)
+                self._frame_left -= len(chunk)
+            if not self._frame_full:
+                break
+            self._frame_left = await conn._read_frame_header()
+            self._frame_full = self._frame_left == MAX_PACKET_LEN
+        self._value_left = 0
+        self._result._value_stream = None
+        self._result = None
+
+
+class _LoadLocalSender(object):
+    """Sends the data of a LOAD DATA LOCAL upload, reporting its progress."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        # a packet of MAX_PACKET_LEN would need an empty one after it
+        self.packet_size = min(connection.local_infile_packet_size,
+                               connection.max_allowed_packet, MAX_PACKET_LEN - 1)
+        self.bytes_sent = 0
+        self._start_time = None
+
+    async def _write_packet(self, data):
+        conn = self.connection
+        if self._start_time is None:
+            self._start_time = trio.current_time()
+        await conn.write_packet(data)
+        self.bytes_sent += len(data)
+        if conn._local_infile_progress is not None:
+            elapsed = trio.current_time() - self._start_time
+            conn._local_infile_progress(
+                self.bytes_sent, self.bytes_sent / elapsed if elapsed > 0 else 0.0)
+
+
+class LoadLocalFile(_LoadLocalSender):
+    #: Bytes read from the file per worker thread call.
+    read_size = 1024 * 1024
+
     def __init__(self, filename, connection):
+        super().__init__(connection)
         self.filename = filename
-        self.connection = connection
 
     async def send_data(self):
-        """Send data packets from the local file to the server"""
+        """Send data packets from the local file to the server
+
+        The file is read in a worker thread, in blocks of several packets,
+        one block ahead of the packets being sent.
+        """
         if not self.connection._sock:
             raise err.InterfaceError("(0, '')")
         conn = self.connection
 
         try:
-            with open(self.filename, 'rb') as open_file:
-                packet_size = min(conn.max_allowed_packet, 16*1024)  # 16KB is efficient enough
-                while True:
-                    chunk = open_file.read(packet_size)
-                    if not chunk:
-                        break
-                    await conn.write_packet(chunk)
+            async with await trio.open_file(self.filename, 'rb') as open_file:
+                send_channel, receive_channel = trio.open_memory_channel(1)
+                async with trio.open_nursery() as nursery:
+                    nursery.start_soon(self._read_ahead, open_file, send_channel)
+                    async with receive_channel:
+                        async for block in receive_channel:
+                            block = memoryview(block)
+                            for offset in range(0, len(block), self.packet_size):
+                                await self._write_packet(
+                                    block[offset:offset+self.packet_size])
         except EnvironmentError as e:
             raise err.OperationalError(1017, "Can't read file '{0}': {1}".format(self.filename, e.errno))
         finally:
             # send the empty packet to signify we are done sending data
             await conn.write_packet(b'')
 
+    async def _read_ahead(self, open_file, send_channel):
+        # whole packets per block, so that only the last packet is short
+        size = max(1, self.read_size // self.packet_size) * self.packet_size
+        async with send_channel:
+            while True:
+                block = await open_file.read(size)
+                if not block:
+                    break
+                await send_channel.send(block)
+
+
+class LoadLocalRows(_LoadLocalSender):
+    """Rows sent in the LOAD DATA file format, in place of a local file."""
+
+    def __init__(self, rows, connection):
+        super().__init__(connection)
+        self.rows = rows
+
+    async def send_data(self):
+        """Send data packets with the rows to the server"""
+        if not self.connection._sock:
+            raise err.InterfaceError("(0, '')")
+        conn = self.connection
+        packet_size = self.packet_size
+        encoding = conn.encoding
+        escape = partial(converters.escape_load_data_item,
+                         charset=conn.charset, mapping=conn.encoders)
+        escaper = converters.load_data_escapers(conn.encoders).get
+        buf = bytearray()
+
+        def add_row(row):
+            line = u'\t'.join([escaper(type(value), escape)(value) for value in row])
+            buf.extend(line.encode(encoding, 'surrogateescape'))
+            buf.extend(b'\n')
+
+        async def flush(size):
+            while len(buf) >= size:
+                # packets end with a line, unless it is longer than a packet
+                end = buf.rfind(b'\n', 0, packet_size) + 1 or packet_size
+                await self._write_packet(bytes(buf[:end]))
+                del buf[:end]
+
+        try:
+            if hasattr(self.rows, '__aiter__'):
+                async for row in self.rows:
+                    add_row(row)
+                    if len(buf) >= packet_size:
+                        await flush(packet_size)
+            else:
+                for row in self.rows:
+                    add_row(row)
+                    if len(buf) >= packet_size:
+                        await flush(packet_size)
+            await flush(1)
+        except BaseException:
+            # Ending the data normally would load the rows sent so far.
+            # There is no way to cancel the upload, except dropping the
+            # connection, which aborts the statement.
+            conn._force_close()
+            raise
+        # send the empty packet to signify we are done sending data
+        await conn.write_packet(b'')
+
+
 class _Transaction:
     def __init__(self, conn):
         self._conn = conn
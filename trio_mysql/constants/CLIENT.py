@@ -19,13 +19,13 @@ MULTI_RESULTS = 1 << 17
 PS_MULTI_RESULTS = 1 << 18
 PLUGIN_AUTH = 1 << 19
 PLUGIN_AUTH_LENENC_CLIENT_DATA = 1 << 21
+DEPRECATE_EOF = 1 << 24
 CAPABILITIES = (
     LONG_PASSWORD | LONG_FLAG | PROTOCOL_41 | TRANSACTIONS
     | SECURE_CONNECTION | MULTI_RESULTS
-    | PLUGIN_AUTH | PLUGIN_AUTH_LENENC_CLIENT_DATA)
+    | PLUGIN_AUTH | PLUGIN_AUTH_LENENC_CLIENT_DATA | DEPRECATE_EOF)
 
 # Not done yet
 CONNECT_ATTRS = 1 << 20
 HANDLE_EXPIRED_PASSWORDS = 1 << 22
 SESSION_TRACK = 1 << 23
-DEPRECATE_EOF = 1 << 24
@@ -87,6 +87,54 @@ def escape_bytes(value, mapping=None):
     return "'%s'" % value.decode('latin1').translate(_escape_bytes_table)
 
 
+# LOAD DATA's default format: tab separated fields, backslash escapes, \N for NULL.
+# Other characters following a backslash stand for themselves, so quotes
+# escaped by escape_item() come out right.
+_escape_load_data_table = [chr(x) for x in range(128)]
+_escape_load_data_table[0] = u'\\0'
+_escape_load_data_table[ord('\\')] = u'\\\\'
+_escape_load_data_table[ord('\n')] = u'\\n'
+_escape_load_data_table[ord('\r')] = u'\\r'
+_escape_load_data_table[ord('\t')] = u'\\t'
+_escape_load_data_table[ord('\032')] = u'\\Z'
+_escape_load_data_bytes_table = _escape_load_data_table + [chr(i) for i in range(0xdc80, 0xdd00)]
+
+def escape_load_data_item(val, charset, mapping=None):
+    """Escape val as a field of a LOAD DATA file in the default format.
+
+    Bytes come out surrogate-escaped, like with escape_bytes(). Other
+    values are escaped by escape_item(), without the quotes; tabs are the
+    only character escape_item() leaves which needs escaping.
+    """
+    if val is None:
+        return u'\\N'
+    if isinstance(val, str):
+        return val.translate(_escape_load_data_table)
+    if isinstance(val, (bytes, bytearray)):
+        return val.decode('latin1').translate(_escape_load_data_bytes_table)
+    val = str(escape_item(val, charset, mapping))
+    if len(val) >= 2 and val[0] == val[-1] == "'":
+        val = val[1:-1]
+    return val.replace(u'\t', u'\\t')
+
+def load_data_escapers(mapping=None):
+    """Return a dict of functions escaping values of common types like
+    escape_load_data_item(), keyed by the exact type of the values."""
+    if mapping is None:
+        mapping = encoders
+    escapers = {
+        type(None): lambda val: u'\\N',
+        str: lambda val: val.translate(_escape_load_data_table),
+    }
+    if mapping.get(int) is escape_int:
+        escapers[int] = int.__repr__
+    if mapping.get(float) is escape_float:
+        escapers[float] = u'%.15g'.__mod__
+    if mapping.get(datetime.date) is escape_date:
+        escapers[datetime.date] = datetime.date.isoformat
+    return escapers
+
+
 def escape_unicode(value, mapping=None):
     return u"'%s'" % _escape_unicode(value)
 
@@ -134,6 +182,30 @@ def _convert_second_fraction(s):
     s = s.ljust(6, '0')
     return int(s[:6])
 
+if hasattr(datetime.datetime, 'fromisoformat'):
+    _datetime_fromisoformat = datetime.datetime.fromisoformat
+    _date_fromisoformat = datetime.date.fromisoformat
+    _time_fromisoformat = datetime.time.fromisoformat
+else:
+    # Python < 3.7: parse the fixed offsets ourselves
+    def _datetime_fromisoformat(s):
+        if not (s[:4] + s[5:7] + s[8:10] + s[11:13] + s[14:16] + s[17:19]).isdigit():
+            raise ValueError(s)
+        return datetime.datetime(
+            int(s[:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]),
+            int(s[14:16]), int(s[17:19]), _convert_second_fraction(s[20:]))
+
+    def _date_fromisoformat(s):
+        if not (s[:4] + s[5:7] + s[8:10]).isdigit():
+            raise ValueError(s)
+        return datetime.date(int(s[:4]), int(s[5:7]), int(s[8:10]))
+
+    def _time_fromisoformat(s):
+        if not (s[:2] + s[3:5] + s[6:8]).isdigit():
+            raise ValueError(s)
+        return datetime.time(int(s[:2]), int(s[3:5]), int(s[6:8]),
+                             _convert_second_fraction(s[9:]))
+
 DATETIME_RE = re.compile(r"(\d{1,4})-(\d{1,2})-(\d{1,2})[T ](\d{1,2}):(\d{1,2}):(\d{1,2})(?:.(\d{1,6}))?")
 
 
@@ -156,6 +228,16 @@ def convert_datetime(obj):
     if isinstance(obj, (bytes, bytearray)):
         obj = obj.decode('ascii')
 
+    # Fast path for the YYYY-MM-DD HH:MM:SS[.ffffff] format sent by MySQL.
+    # Anything else, including zero dates, goes through the regex below.
+    if (len(obj) >= 19 and obj[4] == '-' and obj[7] == '-' and obj[10] in ' T'
+            and obj[13] == ':' and obj[16] == ':'
+            and (len(obj) == 19 or (obj[19] == '.' and obj[20:].isdigit()))):
+        try:
+            return _datetime_fromisoformat(obj)
+        except ValueError:
+            pass
+
     m = DATETIME_RE.match(obj)
     if not m:
         return convert_date(obj)
@@ -190,6 +272,25 @@ def convert_timedelta(obj):
     if isinstance(obj, (bytes, bytearray)):
         obj = obj.decode('ascii')
 
+    # Fast path for the [-]HHH:MM:SS[.ffffff] format sent by MySQL.
+    parts = obj.split(':')
+    if len(parts) == 3:
+        hours, minutes, seconds = parts
+        seconds, _, fraction = seconds.partition('.')
+        negative = hours[:1] == '-'
+        if negative:
+            hours = hours[1:]
+        if (0 < len(hours) <= 3 and len(minutes) == 2 and len(seconds) == 2
+                and (hours + minutes + seconds + fraction).isdigit()):
+            try:
+                tdelta = datetime.timedelta(
+                    0, int(hours) * 3600 + int(minutes) * 60 + int(seconds),
+                    _convert_second_fraction(fraction))
+            except ValueError:
+                pass
+            else:
+                return -tdelta if negative else tdelta
+
     m = TIMEDELTA_RE.match(obj)
     if not m:
         return obj
@@ -238,6 +339,14 @@ def convert_time(obj):
     if isinstance(obj, (bytes, bytearray)):
         obj = obj.decode('ascii')
 
+    # Fast path for the HH:MM:SS[.ffffff] format sent by MySQL.
+    if (len(obj) >= 8 and obj[2] == ':' and obj[5] == ':'
+            and (len(obj) == 8 or (obj[8] == '.' and obj[9:].isdigit()))):
+        try:
+            return _time_fromisoformat(obj)
+        except ValueError:
+            pass
+
     m = TIME_RE.match(obj)
     if not m:
         return obj
@@ -268,6 +377,12 @@ def convert_date(obj):
     """
     if isinstance(obj, (bytes, bytearray)):
         obj = obj.decode('ascii')
+    # Fast path for the YYYY-MM-DD format sent by MySQL.
+    if len(obj) == 10 and obj[4] == '-' and obj[7] == '-':
+        try:
+            return _date_fromisoformat(obj)
+        except ValueError:
+            pass
     try:
         return datetime.date(*[ int(x) for x in obj.split('-', 2) ])
     except ValueError:
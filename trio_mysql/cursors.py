@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 from __future__ import print_function, absolute_import
-from functools import partial
+from functools import lru_cache, partial
+import keyword
+from operator import itemgetter
 import sys
 import re
 import warnings
 
+import trio
+
 from . import err
 
 
@@ -17,6 +21,76 @@ RE_INSERT_VALUES = re.compile(
     r"(\s*(?:ON DUPLICATE.*)?);?\s*\Z",
     re.IGNORECASE | re.DOTALL)
 
+#: Regular expression for the placeholders converted by prepared statements.
+RE_PLACEHOLDER = re.compile(r"%%|%s|%\(([^)]*)\)s")
+
+
+@lru_cache(maxsize=256)
+def _convert_placeholders(query):
+    """Turn a query using %s or %(name)s into one using ``?`` placeholders.
+
+    Returns the converted query and the parameter names, or None for
+    positional parameters.
+    """
+    names = []
+    positional = False
+    parts = []
+    pos = 0
+    for m in RE_PLACEHOLDER.finditer(query):
+        parts.append(query[pos:m.start()])
+        pos = m.end()
+        token = m.group(0)
+        if token == '%%':
+            parts.append('%')
+            continue
+        parts.append('?')
+        if token == '%s':
+            positional = True
+        else:
+            names.append(m.group(1))
+    parts.append(query[pos:])
+    if positional and names:
+        raise err.ProgrammingError("Cannot mix %s and %(name)s placeholders")
+    return ''.join(parts), (tuple(names) if names else None)
+
+
+@lru_cache(maxsize=256)
+def _compile_values(values, encoding):
+    """Split the VALUES part of an executemany query into its placeholders
+    and the encoded literal chunks around them.
+
+    Returns the first chunk and a tuple of (placeholder, following chunk)
+    pairs, where placeholders are indexes for %s or names for %(name)s.
+    Returns None if values uses any other format.
+    """
+    chunks = []
+    slots = []
+    parts = []
+    pos = 0
+    for m in RE_PLACEHOLDER.finditer(values):
+        literal = values[pos:m.start()]
+        if '%' in literal:
+            return None
+        parts.append(literal)
+        pos = m.end()
+        if m.group(0) == '%%':
+            parts.append('%')
+            continue
+        chunks.append(''.join(parts))
+        parts = []
+        slots.append(len(slots) if m.group(0) == '%s' else m.group(1))
+    literal = values[pos:]
+    if '%' in literal or len(set(map(type, slots))) > 1:
+        return None
+    parts.append(literal)
+    chunks.append(''.join(parts))
+    chunks = [c.encode(encoding, 'surrogateescape') for c in chunks]
+    return chunks[0], tuple(zip(slots, chunks[1:]))
+
+
+def _quote_identifier(name):
+    return u'`%s`' % name.replace(u'`', u'``')
+
 
 class Cursor(object):
     """
@@ -35,8 +109,33 @@ class Cursor(object):
     #: Default value of max_allowed_packet is 1048576.
     max_stmt_length = 1024000
 
+    #: Max number of statements which :meth:`executemany` sends at once
+    #: when it cannot turn them into a multiple-row INSERT. None means they
+    #: are sent one by one, and the first error stops the others.
+    max_pipeline_length = None
+
+    #: Seconds for which :meth:`execute` keeps results in the connection's
+    #: ``result_cache``, unless the query gives its own ``cache_ttl``.
+    #: None means results are not cached. Unbuffered cursors ignore it.
+    cache_ttl = None
+
+    #: Tags given to the results this cursor caches, unless the query gives
+    #: its own ``cache_tags``. See :meth:`trio_mysql.cache.ResultCache.invalidate`.
+    cache_tags = ()
+
+    #: Whether rows are :class:`~trio_mysql.connections.LazyRow` objects,
+    #: which only decode the values that are read.
+    lazy_rows = False
+
+    #: Whether values are returned as the bytes the server sent, or None
+    #: for NULL, without decoding or converting them.
+    raw_rows = False
+
     _defer_warnings = False
 
+    #: Whether :meth:`execute` uses server-side prepared statements by default.
+    _prepared = False
+
     def __init__(self, connection):
         self.connection = connection
         self.description = None
@@ -145,7 +244,8 @@ class Cursor(object):
 
         return query
 
-    async def execute(self, query, args=None):
+    async def execute(self, query, args=None, prepared=None, cache_ttl=None,
+                      cache_tags=None):
         """Execute a query
 
         :param str query: Query to execute.
@@ -153,6 +253,17 @@ class Cursor(object):
         :param args: parameters used with query. (optional)
         :type args: tuple, list or dict
 
+        :param prepared: Run the query as a server-side prepared statement,
+            sending only the parameters if the connection already prepared it.
+            (default: False, True for :class:`PreparedCursor`)
+
+        :param cache_ttl: Seconds for which the result may be reused from the
+            connection's ``result_cache``, and is kept there.
+            (default: :attr:`cache_ttl`)
+
+        :param cache_tags: Tags to invalidate the cached result with.
+            (default: :attr:`cache_tags`)
+
         :return: Number of affected rows
         :rtype: int
 
@@ -162,12 +273,54 @@ class Cursor(object):
         while await self.nextset():
             pass
 
+        if prepared is None:
+            prepared = self._prepared
+        if cache_ttl is None:
+            cache_ttl = self.cache_ttl
+        cache = None
+        if cache_ttl is not None:
+            cache = self._get_db().result_cache
+        if cache_tags is None:
+            cache_tags = self.cache_tags
+
+        if prepared:
+            if self.raw_rows:
+                raise err.NotSupportedError(
+                    "Raw rows are not supported with prepared statements")
+            sql, params = self._prepared_query(query, args)
+            if cache is None:
+                result = await self._query_prepared(sql, params)
+            else:
+                result = await self._query_cached(
+                    cache, cache_ttl, cache_tags, self.mogrify(query, args), sql, params)
+            self._executed = query
+            return result
+
         query = self.mogrify(query, args)
 
-        result = await self._query(query)
+        if cache is None:
+            result = await self._query(query)
+        else:
+            result = await self._query_cached(cache, cache_ttl, cache_tags, query)
         self._executed = query
         return result
 
+    def _prepared_query(self, query, args):
+        """Return the query with ``?`` placeholders, and its parameters."""
+        conn = self._get_db()
+        if isinstance(query, (bytes, bytearray)):
+            query = query.decode(conn.encoding, 'surrogateescape')
+        if args is None:
+            return query, ()
+        sql, names = _convert_placeholders(query)
+        if names is not None:
+            params = tuple(args[name] for name in names)
+        elif isinstance(args, (tuple, list)):
+            params = tuple(args)
+        else:
+            params = (args,)
+        return sql, params
+
     async def executemany(self, query, args):
         # type: (str, list) -> int
         """Run several data against one query
@@ -178,7 +331,10 @@ class Cursor(object):
 
         This method improves performance on multiple-row INSERT and
         REPLACE. Otherwise it is equivalent to looping over args with
-        execute().
+        execute(), unless :attr:`max_pipeline_length` is set: then up to
+        that many statements are sent before reading any response. When
+        one of them fails, the others sent along with it still run, and
+        the error is raised once their responses are read.
         """
         if not args:
             return
@@ -193,40 +349,145 @@ class Cursor(object):
                                          self.max_stmt_length,
                                          self._get_db().encoding)
 
+        if self.max_pipeline_length:
+            return await self._do_execute_many_pipelined(query, args)
+
         cnt = 0
         for arg in args:
             cnt += await self.execute(query, arg)
         self.rowcount = cnt
         return cnt
 
+    async def _do_execute_many_pipelined(self, query, args):
+        conn = self._get_db()
+        while await self.nextset():
+            pass
+        pipeline = conn.pipeline(Cursor)
+        rows = 0
+        for arg in args:
+            pipeline._add(self, None, query, arg, self._prepared)
+            if len(pipeline) >= self.max_pipeline_length:
+                rows += await pipeline.run()
+        rows += await pipeline.run()
+        # like after execute(), the result is the last statement's
+        self._executed = query
+        await self._do_get_result()
+        self.rowcount = rows
+        return rows
+
     async def _do_execute_many(self, prefix, values, postfix, args, max_stmt_length, encoding):
         conn = self._get_db()
-        escape = self._escape_args
         if isinstance(prefix, str):
             prefix = prefix.encode(encoding)
         if isinstance(postfix, str):
             postfix = postfix.encode(encoding)
         sql = bytearray(prefix)
         args = iter(args)
-        v = values % escape(next(args), conn)
-        if isinstance(v, str):
-            v = v.encode(encoding, 'surrogateescape')
-        sql += v
+        first = next(args)
+        render = self._values_renderer(values, first, conn, encoding)
+        render(sql, first)
         rows = 0
         for arg in args:
-            v = values % escape(arg, conn)
-            if isinstance(v, str):
-                v = v.encode(encoding, 'surrogateescape')
-            if len(sql) + len(v) + len(postfix) + 1 > max_stmt_length:
-                rows += await self.execute(sql + postfix)
+            size = len(sql)
+            sql += b','
+            render(sql, arg)
+            if len(sql) + len(postfix) > max_stmt_length:
+                v = sql[size + 1:]
+                del sql[size:]
+                rows += await self.execute(sql + postfix, prepared=False)
                 sql = bytearray(prefix)
-            else:
-                sql += b','
-            sql += v
-        rows += await self.execute(sql + postfix)
+                sql += v
+        rows += await self.execute(sql + postfix, prepared=False)
         self.rowcount = rows
         return rows
 
+    def _values_renderer(self, values, first, conn, encoding):
+        """Return a function appending values, filled with the escaped
+        arguments of a row, to a bytearray.
+
+        Each placeholder gets the encoder for the type of its value in
+        the first row. Rows which do not match the template, like the
+        first row, are escaped and formatted as with :meth:`execute`.
+        """
+        escape = self._escape_args
+
+        def render_formatted(out, arg):
+            v = values % escape(arg, conn)
+            if isinstance(v, str):
+                v = v.encode(encoding, 'surrogateescape')
+            out += v
+
+        compiled = _compile_values(values, encoding)
+        if compiled is None:
+            return render_formatted
+        head, slots = compiled
+        named = bool(slots) and isinstance(slots[0][0], str)
+        if named != isinstance(first, dict):
+            return render_formatted
+        if not named and not isinstance(first, (tuple, list)):
+            if len(slots) != 1:
+                return render_formatted
+            first = (first,)
+            single = True
+        else:
+            single = False
+            if not named and len(first) != len(slots):
+                return render_formatted
+
+        encode_other = conn._literal_encoder(None)
+        columns = []
+        for key, chunk in slots:
+            type_ = type(first[key])
+            columns.append((key, type_, conn._literal_encoder(type_), chunk))
+        columns = tuple(columns)
+        row_types = dict if named else (tuple, list)
+        count = len(columns)
+
+        def render(out, arg):
+            if single:
+                if isinstance(arg, (tuple, list, dict)):
+                    return render_formatted(out, arg)
+                arg = (arg,)
+            elif not isinstance(arg, row_types) or (not named and len(arg) != count):
+                return render_formatted(out, arg)
+            out += head
+            for key, type_, encode, chunk in columns:
+                v = arg[key]
+                out += encode(v) if type(v) is type_ else encode_other(v)
+                out += chunk
+        return render
+
+    async def load_rows(self, table, columns, rows):
+        """Insert rows into table with LOAD DATA LOCAL INFILE.
+
+        The rows are written in the LOAD DATA file format while they are
+        sent, so no file is needed. This is much faster than INSERT for
+        large amounts of data. The connection must be opened with
+        ``local_infile=True``.
+
+        :param str table: The table name, which may be qualified with
+            the database name.
+        :param columns: The names of the columns the rows fill.
+        :param rows: An iterable, an async iterable or a
+            :class:`trio.abc.ReceiveChannel` of sequences of values.
+        :return: Number of rows inserted.
+
+        Values are escaped like by :meth:`execute`, and None becomes NULL.
+        If iterating over rows fails, the connection is closed to abort
+        the statement. Tables without transactions may keep the rows which
+        were sent until then, but never part of a row.
+        """
+        conn = self._get_db()
+        query = (u"LOAD DATA LOCAL INFILE 'rows' INTO TABLE %s CHARACTER SET %s (%s)" % (
+            u'.'.join(_quote_identifier(name) for name in table.split('.')),
+            conn.charset,
+            u', '.join(_quote_identifier(column) for column in columns)))
+        conn._load_local_rows = rows
+        try:
+            return await self.execute(query, prepared=False)
+        finally:
+            conn._load_local_rows = None
+
     async def callproc(self, procname, args=()):
         """Execute stored procedure procname with args
 
@@ -299,6 +560,48 @@ class Cursor(object):
         self.rownumber = len(self._rows)
         return result
 
+    async def fetch_columns(self, size=None):
+        """Fetch the next rows as columns.
+
+        Integer and floating point columns are returned as :mod:`array`
+        buffers, which convert to NumPy arrays without copying. See
+        :class:`~trio_mysql.columns.Column`.
+
+        :param size: The number of rows to fetch, or None for all the
+            remaining rows.
+        :return: A list with a :class:`~trio_mysql.columns.Column` for each
+            column of the result set, in the order of :attr:`description`.
+        """
+        self._check_executed()
+        if self._result is None:
+            return []
+        rows = self._result.rows or ()
+        end = len(rows) if size is None else self.rownumber + size
+        rows = rows[self.rownumber:end]
+        self.rownumber += len(rows)
+        return _columns_from_rows(self._result, rows)
+
+    async def fetch_columns(self, size=None):
+        """Fetch the next rows as columns.
+
+        Integer and floating point columns are returned as :mod:`array`
+        buffers, which convert to NumPy arrays without copying. See
+        :class:`~trio_mysql.columns.Column`.
+
+        :param size: The number of rows to fetch, or None for all the
+            remaining rows.
+        :return: A list with a :class:`~trio_mysql.columns.Column` for each
+            column of the result set, in the order of :attr:`description`.
+        """
+        self._check_executed()
+        if self._result is None:
+            return []
+        rows = self._result.rows or ()
+        end = len(rows) if size is None else self.rownumber + size
+        rows = rows[self.rownumber:end]
+        self.rownumber += len(rows)
+        return _columns_from_rows(self._result, rows)
+
     def __iter__(self):
         if self._rows is None or self.rownumber:
             return self
@@ -324,6 +627,20 @@ class Cursor(object):
         res = self._rows[self.rownumber]
         self.rownumber += 1
         return res
+
+    def batches(self, size=None):
+        """Iterate over the remaining rows in batches of up to size rows,
+        as returned by :meth:`fetchmany`.
+
+        ::
+
+            async for rows in cursor.batches(1000):
+                ...
+
+        :param size: The number of rows per batch. (default: :attr:`arraysize`)
+        """
+        self._check_executed()
+        return RowBatches(self, size or self.arraysize)
         
     async def scroll(self, value, mode='relative'):
         self._check_executed()
@@ -341,7 +658,45 @@ class Cursor(object):
     async def _query(self, q):
         conn = self._get_db()
         self._last_executed = q
-        await conn.query(q)
+        await conn.query(q, lazy=self.lazy_rows, raw=self.raw_rows)
+        await self._do_get_result()
+        return self.rowcount
+
+    async def _query_prepared(self, q, args):
+        conn = self._get_db()
+        self._last_executed = q
+        await conn.execute_prepared(q, args, lazy=self.lazy_rows)
+        await self._do_get_result()
+        return self.rowcount
+
+    async def _query_cached(self, cache, ttl, tags, key_sql, q=None, args=None):
+        """Get the result of a query from cache, or run it and cache it.
+
+        The query is sent as key_sql, or as the prepared statement q with
+        args if q is given.
+        """
+        conn = self._get_db()
+        self._last_executed = key_sql if q is None else q
+        # a cached result replaces the current one, which must be read first
+        await conn._finish_previous_result()
+        if not isinstance(key_sql, str):
+            # executemany() builds its statements in a bytearray
+            key_sql = bytes(key_sql)
+        key = (conn.host, conn.port, conn.unix_socket, conn.user, conn._current_db,
+               conn.encoding, conn.use_unicode, q is not None, self.lazy_rows,
+               self.raw_rows, key_sql)
+
+        async def run():
+            received = conn._bytes_received
+            if q is None:
+                await conn.query(key_sql, lazy=self.lazy_rows, raw=self.raw_rows)
+            else:
+                await conn.execute_prepared(q, args, lazy=self.lazy_rows)
+            return conn._result, conn._bytes_received - received
+
+        result = await cache._get(key, run, ttl, tags)
+        conn._result = result
+        conn._affected_rows = result.affected_rows
         await self._do_get_result()
         return self.rowcount
 
@@ -385,6 +740,17 @@ class Cursor(object):
     NotSupportedError = err.NotSupportedError
 
 
+def _field_names(fields):
+    """Column names of a result, qualified by their table when repeated."""
+    names = []
+    for f in fields:
+        name = f.name
+        if name in names:
+            name = f.table_name + '.' + name
+        names.append(name)
+    return names
+
+
 class DictCursorMixin(object):
     # You can override this to use OrderedDict or other dict-like types.
     dict_type = dict
@@ -393,11 +759,7 @@ class DictCursorMixin(object):
         await super()._do_get_result()
         fields = []
         if self.description:
-            for f in self._result.fields:
-                name = f.name
-                if name in fields:
-                    name = f.table_name + '.' + name
-                fields.append(name)
+            fields = _field_names(self._result.fields)
             self._fields = fields
 
         if fields and self._rows:
@@ -413,6 +775,143 @@ class DictCursor(DictCursorMixin, Cursor):
     """A cursor which returns results as a dictionary"""
 
 
+class Row(tuple):
+    """
+    A row of a :class:`RowCursor`: a tuple, whose values can also be read
+    by column name, like ``row.name`` or ``row['name']``.
+
+    Each result set gets its own subclass of Row, which knows the column
+    names, so rows take no more memory than plain tuples. Like with
+    :class:`DictCursor`, a column name which is repeated is prefixed with
+    its table, e.g. ``row['t2.id']``. Attributes only exist for column
+    names which are identifiers and do not start with an underscore.
+
+    Iterating, ``in``, ``len()`` and comparisons work on the values, like
+    for any tuple.
+    """
+
+    __slots__ = ()
+
+    #: The column names, in order.
+    _fields = ()
+    _index = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                key = self._index[key]
+            except KeyError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        """Return the value of a column, or default if there is no such column."""
+        index = self._index.get(key)
+        if index is None:
+            return default
+        return tuple.__getitem__(self, index)
+
+    def keys(self):
+        """Return the column names."""
+        return list(self._fields)
+
+    def items(self):
+        """Return (column name, value) pairs."""
+        return list(zip(self._fields, self))
+
+    def _asdict(self):
+        """Return the row as a dict, like the rows of :class:`DictCursor`."""
+        return dict(zip(self._fields, self))
+
+    def __repr__(self):
+        return 'Row(%s)' % ', '.join(
+            '%s=%r' % (name, value) for name, value in zip(self._fields, self))
+
+    def __reduce__(self):
+        return _make_row, (self._fields, tuple(self))
+
+
+@lru_cache(maxsize=256)
+def _row_class(fields):
+    """Return the :class:`Row` subclass for a tuple of column names."""
+    namespace = {
+        '__slots__': (),
+        '_fields': fields,
+        '_index': dict((name, i) for i, name in enumerate(fields)),
+    }
+    for i, name in enumerate(fields):
+        if (name.isidentifier() and not keyword.iskeyword(name) and
+                not name.startswith('_') and not hasattr(Row, name)):
+            namespace[name] = property(itemgetter(i))
+    return type('Row', (Row,), namespace)
+
+
+def _make_row(fields, values):
+    return _row_class(fields)(values)
+
+
+class RowCursorMixin(object):
+    async def _do_get_result(self):
+        await super()._do_get_result()
+        if self.description:
+            self._row_class = _row_class(tuple(_field_names(self._result.fields)))
+            if self._rows:
+                self._rows = list(map(self._row_class, self._rows))
+
+    def _conv_row(self, row):
+        if row is None:
+            return None
+        return self._row_class(row)
+
+
+class RowCursor(RowCursorMixin, Cursor):
+    """
+    A cursor which returns results as :class:`Row` objects: tuples whose
+    values can also be read by column name. They are as convenient as the
+    dicts of :class:`DictCursor`, and several times smaller.
+    """
+
+
+class LazyCursor(Cursor):
+    """
+    A cursor which returns rows that decode each value when it is first
+    read, see :class:`~trio_mysql.connections.LazyRow`. Useful for wide
+    rows of which only a few columns are read.
+    """
+
+    lazy_rows = True
+
+
+class RawCursor(Cursor):
+    """
+    A cursor which returns the values of rows as the bytes the server sent,
+    with None for NULL, for relaying rows elsewhere without the cost of
+    decoding them. :attr:`description` still gives the type of each column.
+
+    Prepared statements are not supported, because their values are not
+    sent as text.
+    """
+
+    raw_rows = True
+
+
+class PreparedCursor(Cursor):
+    """
+    A cursor which runs queries as server-side prepared statements.
+
+    Each distinct query is prepared once per connection and kept in its
+    statement cache (see the ``prepared_cache_size`` connection argument),
+    so repeated executions only send the parameters. Placeholders are the
+    same as with :class:`Cursor`.
+
+    Rows use the binary protocol: integer, floating point and temporal
+    columns are decoded natively, and the connection's ``conv`` decoders
+    only apply to the other column types.
+    """
+
+    _prepared = True
+
+
 class SSCursor(Cursor):
     """
     Unbuffered Cursor, mainly useful for queries that return a lot of data,
@@ -431,6 +930,8 @@ class SSCursor(Cursor):
 
     _defer_warnings = True
 
+    _prefetch = None
+
     def _conv_row(self, row):
         return row
 
@@ -439,6 +940,7 @@ class SSCursor(Cursor):
         if conn is None:
             return
 
+        await self._stop_prefetch()
         if self._result is not None and self._result is conn._result:
             await self._result._finish_unbuffered_query()
 
@@ -451,15 +953,114 @@ class SSCursor(Cursor):
     async def _query(self, q):
         conn = self._get_db()
         self._last_executed = q
-        await conn.query(q, unbuffered=True)
+        await conn.query(q, unbuffered=True, lazy=self.lazy_rows, raw=self.raw_rows)
+        await self._do_get_result()
+        return self.rowcount
+
+    async def _query_prepared(self, q, args):
+        conn = self._get_db()
+        self._last_executed = q
+        await conn.execute_prepared(q, args, unbuffered=True, lazy=self.lazy_rows)
         await self._do_get_result()
         return self.rowcount
 
+    async def _query_cached(self, cache, ttl, tags, key_sql, q=None, args=None):
+        # the rows are not kept, so there is nothing to cache
+        if q is None:
+            return await self._query(key_sql)
+        return await self._query_prepared(q, args)
+
     async def nextset(self):
+        await self._stop_prefetch()
         return await self._nextset(unbuffered=True)
 
+    def prefetch(self, max_rows=None, max_bytes=None):
+        """
+        Read and decode the rows of the current result in the background::
+
+            await cur.execute("SELECT * FROM big_table")
+            async with cur.prefetch(max_rows=500):
+                async for batch in cur.batches(100):
+                    await process(batch)
+
+        While the block runs, a task reads rows ahead of the fetch methods,
+        so that the network is used while the application processes the
+        rows it already got. It stops reading while the rows waiting to be
+        fetched reach about max_rows rows, or max_bytes bytes of row data.
+
+        When the block ends, the task stops, and the rows which were not
+        fetched are skipped, like by :meth:`aclose` or the next
+        :meth:`execute`. If the block ends with an exception, the task is
+        cancelled instead; if that happens while it reads a row, the
+        connection is closed. Fetching the rows after those it read then
+        raises :class:`~trio_mysql.err.InterfaceError`.
+
+        :param max_rows: The number of rows to read ahead. (default: 1000,
+            unless max_bytes is set)
+        :param max_bytes: The amount of row data to read ahead, in bytes.
+            (default: None)
+        """
+        self._check_executed()
+        if self._prefetch is not None:
+            raise err.ProgrammingError("Rows are already being prefetched")
+        if max_rows is None and max_bytes is None:
+            max_rows = 1000
+        return _PrefetchContext(self, max_rows, max_bytes)
+
+    async def _stop_prefetch(self):
+        prefetch, self._prefetch = self._prefetch, None
+        if prefetch is None:
+            return
+        await prefetch.aclose()
+        result = self._result
+        conn = self.connection
+        if conn is not None and conn._sock is not None and result is conn._result:
+            await result._finish_unbuffered_query()
+
+    async def fetch_columns(self, size=None):
+        """Fetch the next rows as columns.
+
+        The rows are decoded straight into the columns, without building
+        a tuple for each row. Call it repeatedly to stream a result set
+        in chunks of size rows; the columns are empty once all the rows
+        have been fetched.
+        """
+        self._check_executed()
+        if self._prefetch is not None:
+            rows = await self._prefetch.read(sys.maxsize if size is None else size)
+            columns = _columns_from_rows(self._result, rows)
+        else:
+            columns = await self._result._read_columns_unbuffered(size)
+        count = len(columns[0]) if columns else 0
+        if size is None or count < size:
+            await self._show_warnings()
+        self.rownumber += count
+        return columns
+
+    async def fetch_columns(self, size=None):
+        """Fetch the next rows as columns.
+
+        The rows are decoded straight into the columns, without building
+        a tuple for each row. Call it repeatedly to stream a result set
+        in chunks of size rows; the columns are empty once all the rows
+        have been fetched.
+        """
+        self._check_executed()
+        if self._prefetch is not None:
+            rows = await self._prefetch.read(float('inf') if size is None else size)
+            columns = _columns_from_rows(self._result, rows)
+        else:
+            columns = await self._result._read_columns_unbuffered(size)
+        count = len(columns[0]) if columns else 0
+        if size is None or count < size:
+            await self._show_warnings()
+        self.rownumber += count
+        return columns
+
     async def read_next(self):
         """Read next row"""
+        if self._prefetch is not None:
+            return self._conv_row(await self._prefetch.read_one())
         return self._conv_row(await self._result._read_rowdata_packet_unbuffered())
 
     async def fetchone(self):
@@ -472,6 +1073,28 @@ class SSCursor(Cursor):
         self.rownumber += 1
         return row
 
+    async def stream_value(self):
+        """
+        Read the next row of a single-column result piecewise, so that a
+        huge value does not have to be held in memory at once.
+
+        :return: a :class:`~trio_mysql.connections.ValueStream` yielding the
+            raw (undecoded) bytes of the value, or None if there are no more
+            rows.
+        """
+        self._check_executed()
+        if self._result is None or self._result.field_count != 1:
+            raise err.ProgrammingError(
+                "stream_value() needs a result with exactly one column")
+        if self._prefetch is not None:
+            raise err.ProgrammingError("stream_value() cannot be used with prefetch()")
+        stream = await self._result._read_value_stream_unbuffered()
+        if stream is None:
+            await self._show_warnings()
+            return None
+        self.rownumber += 1
+        return stream
+
     async def fetchall(self):
         """
         Fetch all, as per MySQLdb. Pretty useless for large queries, as
@@ -500,20 +1123,23 @@ class SSCursor(Cursor):
         return res
 
     async def fetchmany(self, size=None):
-        """Fetch many"""
+        """Fetch many
+
+        The rows which were already received from the server are decoded
+        together, without waiting for the network.
+        """
         self._check_executed()
         if size is None:
             size = self.arraysize
 
-        rows = []
-        for i in range(size):
-            row = await self.read_next()
-            if row is None:
-                await self._show_warnings()
-                break
-            rows.append(row)
-            self.rownumber += 1
-        return rows
+        if self._prefetch is not None:
+            rows = await self._prefetch.read(size)
+        else:
+            rows = await self._result._read_rowdata_packets_unbuffered(size)
+        if len(rows) < size:
+            await self._show_warnings()
+        self.rownumber += len(rows)
+        return [self._conv_row(row) for row in rows]
 
     async def scroll(self, value, mode='relative'):
         self._check_executed()
@@ -539,5 +1165,192 @@ class SSCursor(Cursor):
             raise err.ProgrammingError("unknown scroll mode %s" % mode)
 
 
+class RowBatches(object):
+    """
+    The remaining rows of a cursor's result, as an async iterator of batches.
+
+    Returned by :meth:`Cursor.batches`.
+    """
+
+    def __init__(self, cursor, size):
+        self._cursor = cursor
+        self.size = size
+
+    if sys.version_info < (3,5,2):
+        async def __aiter__(self):
+            return self
+    else:
+        def __aiter__(self):
+            return self
+
+    async def __anext__(self):
+        rows = await self._cursor.fetchmany(self.size)
+        if not rows:
+            raise StopAsyncIteration
+        return rows
+
+
+def _columns_from_rows(result, rows):
+    """Put decoded rows of result into columns."""
+    columns = result._new_columns()
+    for i, column in enumerate(columns):
+        column._extend([row[i] for row in rows])
+    return columns
+
+
+def _columns_from_rows(result, rows):
+    """Put decoded rows of result into columns."""
+    columns = result._new_columns()
+    for i, column in enumerate(columns):
+        column._extend([row[i] for row in rows])
+    return columns
+
+
+class _Prefetch(object):
+    """Rows of an unbuffered result, read ahead by a background task.
+
+    The task sends batches of rows through a memory channel. The limits
+    are split over the channel's buffer and the batch blocked in send().
+    """
+
+    _parts = 4
+
+    def __init__(self, result, max_rows, max_bytes):
+        self._result = result
+        self._batch_rows = max(1, max_rows // self._parts) if max_rows is not None else float('inf')
+        self._batch_bytes = max(1, max_bytes // self._parts) if max_bytes is not None else None
+        self._send, self._receive = trio.open_memory_channel(self._parts - 1)
+        self._finished = trio.Event()
+        self._error = None
+        self._complete = False
+        self._batch = []
+        self._pos = 0
+
+    async def run(self):
+        result = self._result
+        conn = result.connection
+        reading = False
+        try:
+            async with self._send:
+                while result.unbuffered_active:
+                    reading = True
+                    try:
+                        rows = await result._read_rowdata_packets_unbuffered(
+                            self._batch_rows, self._batch_bytes)
+                    except err.MySQLError as e:
+                        # the error packet ended the result
+                        reading = False
+                        self._error = e
+                        break
+                    reading = False
+                    if rows:
+                        await self._send.send(rows)
+                self._complete = True
+        except trio.BrokenResourceError:
+            # the cursor stopped fetching
+            pass
+        finally:
+            if reading:
+                # stopped in the middle of a packet
+                conn._force_close()
+            self._finished.set()
+
+    async def read_one(self):
+        if self._pos < len(self._batch):
+            row = self._batch[self._pos]
+            self._pos += 1
+            return row
+        rows = await self.read(1)
+        return rows[0] if rows else None
+
+    async def read(self, size):
+        rows = []
+        while len(rows) < size:
+            if self._pos >= len(self._batch):
+                try:
+                    self._batch = await self._receive.receive()
+                except (trio.EndOfChannel, trio.ClosedResourceError):
+                    self._batch = []
+                    self._pos = 0
+                    if self._error is not None:
+                        error, self._error = self._error, None
+                        raise error
+                    if not self._complete:
+                        raise err.InterfaceError(
+                            "Prefetching stopped before the end of the result")
+                    break
+                self._pos = 0
+            end = self._pos + size - len(rows)
+            rows += self._batch[self._pos:end]
+            self._pos = min(end, len(self._batch))
+        return rows
+
+    async def aclose(self):
+        """Stop the task, and wait until it no longer reads."""
+        await self._receive.aclose()
+        await self._finished.wait()
+
+
+class _PrefetchContext(object):
+    """Runs the prefetching task of a cursor for the duration of a block."""
+
+    def __init__(self, cursor, max_rows, max_bytes):
+        self._cursor = cursor
+        self._max_rows = max_rows
+        self._max_bytes = max_bytes
+        self._nursery = None
+        self._nursery_manager = None
+
+    async def __aenter__(self):
+        cursor = self._cursor
+        if cursor._prefetch is not None:
+            raise err.ProgrammingError("Rows are already being prefetched")
+        self._nursery_manager = trio.open_nursery()
+        self._nursery = await self._nursery_manager.__aenter__()
+        cursor._prefetch = _Prefetch(cursor._result, self._max_rows, self._max_bytes)
+        self._nursery.start_soon(cursor._prefetch.run)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        mgr, self._nursery_manager = self._nursery_manager, None
+        try:
+            if exc_info[0] is None:
+                await self._cursor._stop_prefetch()
+            else:
+                # the rows read so far can still be fetched, then fetching
+                # fails as the task did not reach the end of the result
+                self._nursery.cancel_scope.cancel()
+        except BaseException:
+            self._nursery.cancel_scope.cancel()
+            raise
+        finally:
+            self._nursery = None
+            await mgr.__aexit__(*exc_info)
+
+    def __enter__(self):
+        raise RuntimeError("You must use 'async with'")
+
+    def __exit__(self, *tb):
+        raise RuntimeError("You must use 'async with'")
+
+
 class SSDictCursor(DictCursorMixin, SSCursor):
     """An unbuffered cursor, which returns results as a dictionary"""
+
+
+class SSRowCursor(RowCursorMixin, SSCursor):
+    """An unbuffered cursor, which returns results as :class:`Row` objects"""
+
+
+class SSRawCursor(SSCursor):
+    """An unbuffered cursor, which returns the values of rows as the bytes
+    the server sent"""
+
+    raw_rows = True
+
+
+class SSLazyCursor(SSCursor):
+    """An unbuffered cursor, which returns rows that decode each value when
+    it is first read"""
+
+    lazy_rows = True
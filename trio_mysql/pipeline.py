@@ -0,0 +1,154 @@
+import trio
+
+from .constants import COMMAND
+from .cursors import SSCursor
+from . import err
+
+
+class Pipeline(object):
+    """
+    Queries which are sent to the server back-to-back, without waiting for
+    each other's response.
+
+    Do not create an instance of a Pipeline yourself. Call
+    :meth:`trio_mysql.connections.Connection.pipeline`, and use the result
+    in an ``async with`` block::
+
+        async with conn.pipeline() as p:
+            c1 = p.execute("SELECT name FROM users WHERE id=%s", (1,))
+            c2 = p.execute("UPDATE users SET seen=NOW() WHERE id=%s", (2,))
+        print(await c1.fetchone(), c2.rowcount)
+
+    :meth:`execute` only queues a query, and returns the cursor which will
+    hold its result. The queued queries are sent when the block exits, or
+    when :meth:`run` is called, and their responses are read in order. N
+    queries thus cost one round trip instead of N.
+
+    The server runs the queries one after the other: when one of them
+    fails, the following ones still run. The first error is raised once
+    all responses have been read. Warnings are not fetched for pipelined
+    queries, and only the first result of a multi-statement query is kept.
+    """
+
+    def __init__(self, connection, cursorclass):
+        if issubclass(cursorclass, SSCursor):
+            raise err.ProgrammingError("Pipelines need a buffered cursor class")
+        self.connection = connection
+        self.cursorclass = cursorclass
+        self._queue = []
+
+    def __enter__(self):
+        raise RuntimeError("You need to use 'async with'")
+
+    def __exit__(self, *tb):
+        raise RuntimeError("You need to use 'async with'")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, cls, exc, tb):
+        if cls is None:
+            await self.run()
+        else:
+            self._queue = []
+
+    def execute(self, query, args=None, prepared=False):
+        """Queue a query.
+
+        The arguments are the same as for :meth:`trio_mysql.cursors.Cursor.execute`.
+
+        :return: The cursor which holds the result once the pipeline has run.
+        """
+        cursor = self.connection.cursor(self.cursorclass)
+        self._add(cursor, cursor, query, args, prepared)
+        return cursor
+
+    def _add(self, cursor, target, query, args, prepared):
+        """Queue a query, using cursor to build it.
+
+        Its result goes to the target cursor, or is only counted in the
+        total returned by :meth:`run` if target is None.
+        """
+        if prepared:
+            if cursor.raw_rows:
+                raise err.NotSupportedError(
+                    "Raw rows are not supported with prepared statements")
+            sql, params = cursor._prepared_query(query, args)
+        else:
+            sql, params = cursor.mogrify(query, args), None
+        self._queue.append((target, query, sql, params, cursor.lazy_rows, cursor.raw_rows))
+
+    def __len__(self):
+        return len(self._queue)
+
+    async def run(self):
+        """Send the queued queries and read their responses.
+
+        :return: The total number of affected rows.
+        """
+        queue, self._queue = self._queue, []
+        if not queue:
+            return 0
+        conn = self.connection
+        await conn._finish_previous_result()
+
+        # Statements which are not in the connection's cache yet are
+        # prepared first, which costs a round trip each.
+        statements = {}
+        for cursor, query, sql, params, lazy, raw in queue:
+            if params is not None and sql not in statements:
+                statements[sql] = await conn.prepare(sql)
+        for sql, stmt in statements.items():
+            if conn._prepared.get(sql) is not stmt:
+                raise err.ProgrammingError(
+                    "Pipeline uses more prepared statements than prepared_cache_size")
+
+        data = []
+        for cursor, query, sql, params, lazy, raw in queue:
+            if params is None:
+                data.append(await conn._command_bytes(COMMAND.COM_QUERY, sql))
+            else:
+                data.append(await conn._command_bytes(
+                    COMMAND.COM_STMT_EXECUTE,
+                    statements[sql]._execute_packet(params, conn.encoding)))
+
+        first_error = None
+        affected_rows = 0
+        traced = bool(conn._query_listeners)
+        started = trio.current_time()
+        async with trio.open_nursery() as nursery:
+            # Responses are read while sending, so that neither side gets
+            # stuck on a full socket buffer.
+            nursery.start_soon(conn._send_all, b''.join(data))
+            for cursor, query, sql, params, lazy, raw in queue:
+                if traced:
+                    conn._trace = conn._new_trace(
+                        COMMAND.COM_QUERY if params is None else COMMAND.COM_STMT_EXECUTE,
+                        sql)
+                    conn._trace.started = started
+                try:
+                    affected_rows += await self._read_result(
+                        cursor, query, sql, params is not None, lazy, raw)
+                except err.MySQLError as e:
+                    if conn._sock is None:
+                        raise
+                    if first_error is None:
+                        first_error = e
+        if first_error is not None:
+            raise first_error
+        return affected_rows
+
+    async def _read_result(self, cursor, query, sql, binary, lazy, raw):
+        conn = self.connection
+        # each command starts a new sequence
+        conn._next_seq_id = 1
+        affected_rows = conn._affected_rows = await conn._read_query_result(
+            binary=binary, lazy=lazy, raw=raw)
+        if cursor is not None:
+            cursor._executed = query
+            cursor._last_executed = sql
+            cursor._defer_warnings = True
+            await cursor._do_get_result()
+        while conn._result.has_next:
+            await conn.next_result()
+        return affected_rows or 0
@@ -0,0 +1,262 @@
+from collections import deque
+import logging
+
+import trio
+
+from .connections import Connection
+from .constants import SERVER_STATUS
+from . import err
+
+log = logging.getLogger(__name__)
+
+
+class Pool(object):
+    """
+    A pool of connections to the same MySQL server.
+
+    Do not create an instance of a Pool yourself. Call
+    :func:`trio_mysql.create_pool`, and use the result in an
+    ``async with`` block::
+
+        async with trio_mysql.create_pool(minsize=2, maxsize=10, host=...) as pool:
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute("SELECT 1")
+
+    :param minsize: Number of connections that are kept open, and opened in
+        the background when the pool starts. (default: 1)
+    :param maxsize: Maximum number of connections; :meth:`acquire` waits
+        until a connection is returned when all of them are in use. (default: 10)
+    :param max_lifetime: Connections older than this many seconds are closed
+        instead of being reused. None means no limit.
+    :param max_idle: Connections which have not been used for this many
+        seconds are closed instead of being reused. None means no limit.
+    :param connect_kwargs: Passed to :class:`~trio_mysql.connections.Connection`.
+
+    Connections which are returned to the pool are cleaned up first:
+    unfinished unbuffered results are read to the end and open
+    transactions are rolled back. Connections that fail this are closed.
+
+    Errors opening the minsize connections in the background are logged
+    to the ``trio_mysql.pool`` logger, and the connection is retried.
+    """
+
+    def __init__(self, minsize=1, maxsize=10, max_lifetime=None, max_idle=None,
+                 **connect_kwargs):
+        if maxsize < 1:
+            raise ValueError("maxsize should be >= 1")
+        if not (0 <= minsize <= maxsize):
+            raise ValueError("minsize should be >= 0 and <= maxsize")
+        self.minsize = minsize
+        self.maxsize = maxsize
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self._connect_kwargs = connect_kwargs
+
+        self._limiter = trio.CapacityLimiter(maxsize)
+        self._idle = deque()  # (connection, created, last_used)
+        self._used = {}  # connection -> (borrower token, created)
+        self._opening = 0
+        self._closed = True
+        self._nursery = None
+        self._nursery_manager = None
+        self._wakeup = trio.Event()
+
+    @property
+    def size(self):
+        """Number of connections currently open or being opened."""
+        return len(self._idle) + len(self._used) + self._opening
+
+    @property
+    def freesize(self):
+        """Number of idle connections."""
+        return len(self._idle)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    async def __aenter__(self):
+        self._nursery_manager = trio.open_nursery()
+        self._nursery = await self._nursery_manager.__aenter__()
+        self._closed = False
+        self._nursery.start_soon(self._maintain)
+        return self
+
+    async def __aexit__(self, *tb):
+        try:
+            with trio.move_on_after(1) as scope:
+                scope.shield = True
+                await self.aclose()
+        finally:
+            mgr, self._nursery_manager = self._nursery_manager, None
+            self._nursery = None
+            await mgr.__aexit__(*tb)
+
+    async def aclose(self):
+        """
+        Close all idle connections and stop the background task.
+
+        Connections which are still checked out are closed when they are
+        returned.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._nursery is not None:
+            self._nursery.cancel_scope.cancel()
+        while self._idle:
+            conn = self._idle.popleft()[0]
+            await conn.aclose()
+
+    def acquire(self):
+        """
+        Check out a connection.
+
+        Use as ``async with pool.acquire() as conn:``; the connection is
+        returned to the pool at the end of the block.
+        """
+        return _PoolConnectionContext(self)
+
+    async def acquire_connection(self):
+        """
+        Check out a connection. It must be handed back with :meth:`release`.
+        """
+        if self._closed:
+            raise err.InterfaceError("Pool is closed")
+        token = object()
+        await self._limiter.acquire_on_behalf_of(token)
+        try:
+            conn, created = await self._get_connection()
+        except BaseException:
+            self._limiter.release_on_behalf_of(token)
+            raise
+        self._used[conn] = (token, created)
+        return conn
+
+    async def _get_connection(self):
+        now = trio.current_time()
+        while self._idle:
+            # most recently used first, so surplus connections go idle
+            conn, created, last_used = self._idle.pop()
+            if conn.open and not self._expired(created, last_used, now):
+                return conn, created
+            await conn.aclose()
+        conn = await self._open_connection()
+        return conn, trio.current_time()
+
+    async def _open_connection(self):
+        self._opening += 1
+        try:
+            conn = Connection(**self._connect_kwargs)
+            await conn.connect()
+            return conn
+        finally:
+            self._opening -= 1
+
+    def _expired(self, created, last_used, now):
+        if self.max_lifetime is not None and now - created > self.max_lifetime:
+            return True
+        if self.max_idle is not None and now - last_used > self.max_idle:
+            return True
+        return False
+
+    async def release(self, conn):
+        """Return a connection to the pool."""
+        token, created = self._used.pop(conn)
+        try:
+            keep = not self._closed and conn.open
+            if keep:
+                with trio.move_on_after(1) as scope:
+                    scope.shield = True
+                    keep = await self._reset(conn)
+                if scope.cancelled_caught:
+                    keep = False
+            if keep:
+                self._idle.append((conn, created, trio.current_time()))
+            else:
+                conn.close()
+                self._wakeup.set()
+        finally:
+            self._limiter.release_on_behalf_of(token)
+
+    async def _reset(self, conn):
+        """Bring a returned connection back to a clean state.
+
+        Returns False if the connection should not be reused.
+        """
+        try:
+            result = conn._result
+            if result is not None and result.unbuffered_active:
+                await result._finish_unbuffered_query()
+            while conn._result is not None and conn._result.has_next:
+                await conn.next_result(unbuffered=True)
+                if conn._result.unbuffered_active:
+                    await conn._result._finish_unbuffered_query()
+            if conn.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+                await conn.rollback()
+        except err.Error:
+            return False
+        return conn.open
+
+    async def _maintain(self):
+        """Keep minsize connections open and close stale idle ones."""
+        interval = min([t for t in (self.max_lifetime, self.max_idle) if t] or [60])
+        retry_delay = None
+        while True:
+            now = trio.current_time()
+            for item in list(self._idle):
+                conn, created, last_used = item
+                if not conn.open or self._expired(created, last_used, now):
+                    self._idle.remove(item)
+                    await conn.aclose()
+
+            failed = False
+            while self.size < self.minsize:
+                try:
+                    conn = await self._open_connection()
+                except Exception as e:
+                    # acquire() reports the error to the caller; here it
+                    # must not end the task, which would end the pool
+                    log.warning("Could not open a connection for the pool: %r", e)
+                    failed = True
+                    break
+                self._idle.appendleft((conn, trio.current_time(), trio.current_time()))
+
+            # retry failed connections sooner, backing off up to interval
+            if failed:
+                retry_delay = min(interval, retry_delay * 2 if retry_delay else 1)
+            else:
+                retry_delay = None
+            self._wakeup = trio.Event()
+            with trio.move_on_after(retry_delay or interval):
+                await self._wakeup.wait()
+
+
+class _PoolConnectionContext(object):
+    def __init__(self, pool):
+        self._pool = pool
+        self._conn = None
+
+    async def __aenter__(self):
+        self._conn = await self._pool.acquire_connection()
+        return self._conn
+
+    async def __aexit__(self, *tb):
+        conn, self._conn = self._conn, None
+        await self._pool.release(conn)
+
+    def __enter__(self):
+        raise RuntimeError("You must use 'async with'")
+
+    def __exit__(self, *tb):
+        raise RuntimeError("You must use 'async with'")
+
+
+def create_pool(minsize=1, maxsize=10, **connect_kwargs):
+    """
+    Create a connection pool; see :class:`Pool` for the arguments.
+
+    Note that you need to use ``async with`` in order to actually use the pool!
+    """
+    return Pool(minsize=minsize, maxsize=maxsize, **connect_kwargs)